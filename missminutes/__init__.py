@@ -0,0 +1,18 @@
+"""missminutes: a personal scheduler that finds time for the things that matter."""
+
+__version__ = "0.1.0"
+
+from .tasks import DependencyType, RecurrencePattern, Session, Tag, Task
+from .timeprofile import DayOfWeek, DaySchedule, TimeProfile, TimeWindow
+
+__all__ = [
+    "DayOfWeek",
+    "DaySchedule",
+    "DependencyType",
+    "RecurrencePattern",
+    "Session",
+    "Tag",
+    "Task",
+    "TimeProfile",
+    "TimeWindow",
+]
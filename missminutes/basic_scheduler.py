@@ -0,0 +1,144 @@
+"""A simple greedy scheduler that packs whole tasks into weekly windows."""
+
+from __future__ import annotations
+
+import bisect
+from collections import deque
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Optional
+
+from .scheduler import SchedulingError
+from .tasks import Task
+from .timedomain import TimeDomain
+from .timeprofile import WeeklySchedule
+
+_ONE_DAY = timedelta(days=1)
+
+
+@dataclass(slots=True)
+class ScheduledTask:
+    """A task pinned to a concrete start and end time."""
+
+    task: Task
+    start_time: datetime
+    end_time: datetime
+
+
+class BasicScheduler:
+    """Greedy earliest-fit scheduler over a :class:`WeeklySchedule`.
+
+    Tasks are placed whole (no session splitting), earliest due date first,
+    into the earliest window slot that fits.
+    """
+
+    MAX_DAYS = 365
+
+    def __init__(self, weekly_schedule: WeeklySchedule):
+        self.weekly_schedule = weekly_schedule
+
+    def schedule_tasks(
+        self,
+        tasks: list[Task],
+        start_date: date,
+        existing_scheduled_tasks: Optional[list[ScheduledTask]] = None,
+    ) -> list[ScheduledTask]:
+        """Place every incomplete task, raising if one misses its due date."""
+        if existing_scheduled_tasks is None:
+            existing_scheduled_tasks = []
+        # deque: the loop consumes from the front, and popleft is O(1)
+        # where list.pop(0) shifts every remaining element.
+        pending_tasks = deque(
+            sorted(
+                (task for task in tasks if not task.completed),
+                key=lambda t: (t.due_date is None, t.due_date),
+            )
+        )
+        scheduled_tasks: list[ScheduledTask] = []
+        if not pending_tasks:
+            return scheduled_tasks
+        # Nothing can legally land past the latest due date, so bound the day
+        # scan there instead of walking sparse calendars indefinitely.
+        due_dates = [t.due_date for t in pending_tasks if t.due_date is not None]
+        if len(due_dates) == len(pending_tasks):
+            horizon = max(d.date() for d in due_dates) + _ONE_DAY
+        else:
+            horizon = start_date + timedelta(days=self.MAX_DAYS)
+        # Busy time as merged sorted spans: conflict probes bisect instead
+        # of scanning every placed task, and any hit is jumped over whole.
+        busy = TimeDomain()
+        for st in existing_scheduled_tasks:
+            busy.add_slot(st.start_time, st.end_time)
+        # Sort each weekday's windows once up front; the day loop below
+        # revisits the same seven lists for the whole horizon.
+        windows_by_day = [
+            sorted(
+                self.weekly_schedule.get_windows_for_weekday(weekday),
+                key=lambda w: w.start_time,
+            )
+            for weekday in range(7)
+        ]
+        # Days until the next weekday with any windows, per weekday, so
+        # sparse schedules hop over empty days instead of visiting each.
+        jump_by_weekday = [
+            next(
+                (
+                    timedelta(days=step)
+                    for step in range(1, 8)
+                    if windows_by_day[(weekday + step) % 7]
+                ),
+                None,
+            )
+            for weekday in range(7)
+        ]
+        current_date = start_date
+        while pending_tasks and current_date < horizon:
+            # Resolve each window to concrete datetimes once per day, so the
+            # placement loop below works on plain precomputed pairs.
+            day_slots = [
+                (
+                    datetime.combine(current_date, window.start_time),
+                    datetime.combine(current_date, window.end_time),
+                )
+                for window in windows_by_day[current_date.weekday()]
+            ]
+            for window_start, window_end in day_slots:
+                current_slot = window_start
+                while pending_tasks and current_slot < window_end:
+                    task = pending_tasks[0]
+                    # Bind hot attributes to locals once per iteration.
+                    task_duration = task.duration
+                    task_due = task.due_date
+                    task_end = current_slot + task_duration
+                    if task_end > window_end:
+                        break
+                    if task_due is not None and task_end > task_due:
+                        raise SchedulingError(
+                            f"Cannot schedule task '{task.title}' before its "
+                            f"due date {task_due}"
+                        )
+                    # Spans are disjoint, so only the last one starting
+                    # before task_end can overlap; a hit means every point
+                    # up to its end conflicts, so jump straight past it.
+                    spans = busy.time_slots
+                    idx = bisect.bisect_left(
+                        spans, task_end, key=lambda s: s.start
+                    )
+                    if idx > 0 and spans[idx - 1].end > current_slot:
+                        current_slot = spans[idx - 1].end
+                        continue
+                    scheduled_tasks.append(ScheduledTask(task, current_slot, task_end))
+                    pending_tasks.popleft()
+                    busy.add_slot(current_slot, task_end)
+                    current_slot = task_end
+            jump = jump_by_weekday[current_date.weekday()]
+            if jump is None:
+                # No weekday has windows; nothing can ever be placed.
+                break
+            current_date += jump
+        if pending_tasks:
+            raise SchedulingError(
+                f"Could not schedule {len(pending_tasks)} task(s) before "
+                f"{horizon}"
+            )
+        return scheduled_tasks
@@ -0,0 +1,323 @@
+"""Google Calendar integration for scheduled sessions."""
+
+from __future__ import annotations
+
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Optional
+
+import google_auth_httplib2
+import httplib2
+import orjson
+import tzlocal
+from google.auth.transport.requests import Request
+from google.oauth2.credentials import Credentials
+from google_auth_oauthlib.flow import InstalledAppFlow
+from googleapiclient.discovery import build
+from googleapiclient.model import JsonModel
+
+from .tasks import Task
+
+
+class _OrjsonModel(JsonModel):
+    """JsonModel that encodes request and response bodies with orjson."""
+
+    def serialize(self, body_value):
+        if (
+            isinstance(body_value, dict)
+            and "data" not in body_value
+            and self._data_wrapper
+        ):
+            body_value = {"data": body_value}
+        return orjson.dumps(body_value).decode()
+
+    def deserialize(self, content):
+        try:
+            body = orjson.loads(content)
+        except orjson.JSONDecodeError:
+            return content.decode() if isinstance(content, bytes) else content
+        if self._data_wrapper and isinstance(body, dict) and "data" in body:
+            body = body["data"]
+        return body
+
+# Built service shared across the process, keyed by the token file's mtime
+# so a token refreshed by another invocation invalidates the cache.
+_SERVICE_CACHE: Optional[tuple[float, Credentials, Any]] = None
+_SERVICE_LOCK = threading.Lock()
+
+# tzlocal probes /etc/localtime and the TZ env var; do it once per process.
+_LOCAL_TZ = str(tzlocal.get_localzone())
+
+
+class CalendarService:
+    """Thin wrapper around the Google Calendar v3 API."""
+
+    SCOPES = ["https://www.googleapis.com/auth/calendar"]
+    CREDENTIALS_FILE = "credentials.json"
+    TOKEN_FILE = "token.json"
+    # Legacy pickle token from older versions, migrated on first load.
+    LEGACY_TOKEN_FILE = "token.pickle"
+    # The Calendar API caps batch requests at 50 operations.
+    BATCH_LIMIT = 50
+    # Refresh credentials only when they are about to expire.
+    REFRESH_THRESHOLD = timedelta(minutes=5)
+
+    def __init__(self, config_dir: Optional[Path] = None):
+        global _SERVICE_CACHE
+        self.config_dir = (
+            Path(config_dir) if config_dir else Path.home() / ".config" / "missminutes"
+        )
+        self.config_dir.mkdir(parents=True, exist_ok=True)
+        self.timezone = _LOCAL_TZ
+        # Static parts of the event body, layered under the per-call fields.
+        self._event_template = {
+            "start": {"timeZone": self.timezone},
+            "end": {"timeZone": self.timezone},
+            "extendedProperties": {"private": {"missminutes_task": "true"}},
+        }
+        self.creds = None
+        self.service = None
+        self._http = None
+        token_mtime = self._token_mtime()
+        with _SERVICE_LOCK:
+            if (
+                _SERVICE_CACHE is not None
+                and _SERVICE_CACHE[0] == token_mtime
+                and _SERVICE_CACHE[1].valid
+            ):
+                _, self.creds, self.service = _SERVICE_CACHE
+            else:
+                self._authenticate()
+                _SERVICE_CACHE = (self._token_mtime(), self.creds, self.service)
+
+    def _token_mtime(self) -> float:
+        token_path = self.config_dir / self.TOKEN_FILE
+        try:
+            return token_path.stat().st_mtime
+        except OSError:
+            return -1.0
+
+    def _load_token(self) -> Optional[Credentials]:
+        """Load stored credentials, migrating any legacy pickle token."""
+        token_path = self.config_dir / self.TOKEN_FILE
+        if token_path.exists():
+            return Credentials.from_authorized_user_info(
+                orjson.loads(token_path.read_bytes()), self.SCOPES
+            )
+        legacy_path = self.config_dir / self.LEGACY_TOKEN_FILE
+        if legacy_path.exists():
+            import pickle
+
+            with open(legacy_path, "rb") as f:
+                creds = pickle.load(f)
+            token_path.write_text(creds.to_json())
+            legacy_path.unlink()
+            return creds
+        return None
+
+    def _authenticate(self) -> None:
+        token_path = self.config_dir / self.TOKEN_FILE
+        self.creds = self._load_token()
+        if not self.creds or not self.creds.valid:
+            if self.creds and self.creds.expired and self.creds.refresh_token:
+                self.creds.refresh(Request())
+            else:
+                flow = InstalledAppFlow.from_client_secrets_file(
+                    str(self.config_dir / self.CREDENTIALS_FILE), self.SCOPES
+                )
+                self.creds = flow.run_local_server(port=0)
+            token_path.write_text(self.creds.to_json())
+        # A single authorized Http held on the service keeps TCP/TLS
+        # connections alive between calls, so consecutive requests skip the
+        # per-call handshake. static_discovery uses the discovery document
+        # bundled with the client library instead of fetching it over HTTP.
+        self._http = google_auth_httplib2.AuthorizedHttp(
+            self.creds, http=httplib2.Http()
+        )
+        self.service = build(
+            "calendar",
+            "v3",
+            http=self._http,
+            model=_OrjsonModel(),
+            cache_discovery=False,
+            static_discovery=True,
+        )
+
+    def _ensure_authenticated(self) -> None:
+        """Refresh credentials only when expired or within the threshold."""
+        global _SERVICE_CACHE
+        if self.creds is None:
+            self._authenticate()
+            return
+        near_expiry = (
+            self.creds.expiry is not None
+            and self.creds.expiry - datetime.utcnow() < self.REFRESH_THRESHOLD
+        )
+        if self.creds.expired or near_expiry:
+            if self.creds.refresh_token:
+                self.creds.refresh(Request())
+                (self.config_dir / self.TOKEN_FILE).write_text(self.creds.to_json())
+            else:
+                self._authenticate()
+            with _SERVICE_LOCK:
+                _SERVICE_CACHE = (self._token_mtime(), self.creds, self.service)
+
+    def _event_body(self, task: Task, scheduled_time: datetime) -> dict:
+        template = self._event_template
+        return {
+            **template,
+            "summary": task.title,
+            "description": task.description,
+            "start": {
+                **template["start"],
+                "dateTime": scheduled_time.isoformat(),
+            },
+            "end": {
+                **template["end"],
+                "dateTime": (scheduled_time + task.duration).isoformat(),
+            },
+            "extendedProperties": {
+                "private": {
+                    **template["extendedProperties"]["private"],
+                    "task_id": task.id,
+                }
+            },
+        }
+
+    def new_batch(self, callback=None):
+        """A fresh BatchHttpRequest for queueing mutations via ``batch=``."""
+        self._ensure_authenticated()
+        return self.service.new_batch_http_request(callback=callback)
+
+    def create_event(
+        self, task: Task, scheduled_time: datetime, batch=None
+    ) -> Optional[str]:
+        """Create a calendar event for a task and return the event id.
+
+        When ``batch`` is given, the request is queued on it (keyed by the
+        task id) instead of being executed, and ``None`` is returned.
+        """
+        self._ensure_authenticated()
+        request = self.service.events().insert(
+            calendarId="primary", body=self._event_body(task, scheduled_time)
+        )
+        if batch is not None:
+            batch.add(request, request_id=task.id)
+            return None
+        return request.execute()["id"]
+
+    def update_event(
+        self, event_id: str, task: Task, scheduled_time: datetime, batch=None
+    ) -> None:
+        self._ensure_authenticated()
+        request = self.service.events().update(
+            calendarId="primary",
+            eventId=event_id,
+            body=self._event_body(task, scheduled_time),
+        )
+        if batch is not None:
+            batch.add(request, request_id=task.id)
+            return
+        request.execute()
+
+    def delete_event(
+        self, event_id: str, batch=None, request_id: Optional[str] = None
+    ) -> None:
+        self._ensure_authenticated()
+        request = self.service.events().delete(
+            calendarId="primary", eventId=event_id
+        )
+        if batch is not None:
+            batch.add(request, request_id=request_id)
+            return
+        request.execute()
+
+    def create_events_batch(
+        self, items: list[tuple[Task, datetime]]
+    ) -> list[Optional[str]]:
+        """Create one event per (task, scheduled_time) pair using batched HTTP.
+
+        Mutations are sent in chunks of :attr:`BATCH_LIMIT` per round trip
+        instead of one request each. Returns the new event ids in input order
+        (``None`` where the API reported an error for that entry).
+        """
+        self._ensure_authenticated()
+        event_ids: list[Optional[str]] = [None] * len(items)
+
+        def callback(request_id, response, exception):
+            if exception is None:
+                event_ids[int(request_id)] = response["id"]
+
+        for chunk_start in range(0, len(items), self.BATCH_LIMIT):
+            batch = self.service.new_batch_http_request(callback=callback)
+            chunk = items[chunk_start : chunk_start + self.BATCH_LIMIT]
+            for offset, (task, scheduled_time) in enumerate(chunk):
+                batch.add(
+                    self.service.events().insert(
+                        calendarId="primary",
+                        body=self._event_body(task, scheduled_time),
+                    ),
+                    request_id=str(chunk_start + offset),
+                )
+            batch.execute()
+        return event_ids
+
+    def update_events_batch(
+        self, items: list[tuple[str, Task, datetime]]
+    ) -> None:
+        """Update events for (event_id, task, scheduled_time) triples in batches."""
+        self._ensure_authenticated()
+        for chunk_start in range(0, len(items), self.BATCH_LIMIT):
+            batch = self.service.new_batch_http_request()
+            for event_id, task, scheduled_time in items[
+                chunk_start : chunk_start + self.BATCH_LIMIT
+            ]:
+                batch.add(
+                    self.service.events().update(
+                        calendarId="primary",
+                        eventId=event_id,
+                        body=self._event_body(task, scheduled_time),
+                    )
+                )
+            batch.execute()
+
+    def delete_events_batch(self, event_ids: list[str]) -> None:
+        """Delete the given events in batches of :attr:`BATCH_LIMIT`."""
+        self._ensure_authenticated()
+        for chunk_start in range(0, len(event_ids), self.BATCH_LIMIT):
+            batch = self.service.new_batch_http_request()
+            for event_id in event_ids[chunk_start : chunk_start + self.BATCH_LIMIT]:
+                batch.add(
+                    self.service.events().delete(
+                        calendarId="primary", eventId=event_id
+                    )
+                )
+            batch.execute()
+
+    def get_all_events(self) -> list[dict]:
+        """All events previously created by missminutes.
+
+        Requests only the fields reconciliation needs and follows page
+        tokens, so large calendars transfer a fraction of the default
+        payload and events past the first page are not dropped.
+        """
+        self._ensure_authenticated()
+        events: list[dict] = []
+        page_token = None
+        while True:
+            response = (
+                self.service.events()
+                .list(
+                    calendarId="primary",
+                    privateExtendedProperty="missminutes_task=true",
+                    fields="nextPageToken,items(id,extendedProperties/private)",
+                    maxResults=2500,
+                    pageToken=page_token,
+                )
+                .execute()
+            )
+            events.extend(response.get("items", []))
+            page_token = response.get("nextPageToken")
+            if not page_token:
+                return events
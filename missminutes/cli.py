@@ -0,0 +1,70 @@
+"""Interactive command-line interface for missminutes."""
+
+from __future__ import annotations
+
+import cmd
+import shlex
+from datetime import datetime, timedelta
+from typing import Optional
+
+from .task_service import TaskService
+from .tasks import Task
+
+
+class MinutesCUI(cmd.Cmd):
+    """A small cmd-based shell over :class:`TaskService`."""
+
+    intro = "missminutes -- type help or ? to list commands."
+    prompt = "(minutes) "
+
+    def __init__(self, service: Optional[TaskService] = None):
+        super().__init__()
+        self.service = service if service is not None else TaskService()
+        self.store = self.service.store
+
+    def do_add(self, arg: str) -> None:
+        '''add "title" <hours> [due YYYY-MM-DDTHH:MM]: add a task.'''
+        parts = shlex.split(arg)
+        if len(parts) < 2:
+            print('usage: add "title" <hours> [due]')
+            return
+        due = datetime.fromisoformat(parts[2]) if len(parts) > 2 else None
+        task = self.service.add_task(
+            Task(parts[0], timedelta(hours=float(parts[1])), due)
+        )
+        print(f"added {task.id}")
+
+    def do_list(self, arg: str) -> None:
+        """list: show all tasks."""
+        for task in self.store.load_tasks():
+            marker = "x" if task.completed else " "
+            print(f"[{marker}] {task.id[:8]}  {task.title}")
+
+    def do_schedule(self, arg: str) -> None:
+        """schedule: show the current schedule."""
+        for st in self.store.load_scheduled_tasks():
+            print(f"{st.start_time:%a %Y-%m-%d %H:%M}  {st.task.title}")
+
+    def do_complete(self, arg: str) -> None:
+        """complete <task_id>: mark a task complete."""
+        try:
+            task = self.service.complete_task(arg.strip())
+        except KeyError as exc:
+            print(exc)
+            return
+        print(f"completed {task.title}")
+
+    def do_quit(self, arg: str) -> bool:
+        """quit: exit missminutes."""
+        # The flush worker is a daemon thread; wait for queued calendar
+        # mutations so quitting inside the coalescing window can't drop them.
+        self.service.flush_calendar()
+        return True
+
+
+def main() -> None:
+    MinutesCUI().cmdloop()
+
+
+if __name__ == "__main__":
+    main()
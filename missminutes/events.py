@@ -0,0 +1,50 @@
+"""Calendar events that block out time from scheduling."""
+
+from __future__ import annotations
+
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Optional
+
+from dateutil.rrule import rrule
+
+
+@dataclass
+class Event:
+    """A fixed appointment that occupies time on the calendar."""
+
+    title: str
+    start_time: datetime
+    end_time: datetime
+    description: str = ""
+    id: str = field(default_factory=lambda: str(uuid.uuid4()))
+
+    @property
+    def duration(self) -> timedelta:
+        return self.end_time - self.start_time
+
+
+@dataclass
+class RecurringEvent(Event):
+    """An event template that repeats on a recurrence rule."""
+
+    recurrence_rule: Optional[rrule] = field(default=None, repr=False, compare=False)
+
+    def get_occurrences(self, start_date: datetime, end_date: datetime) -> list[Event]:
+        """Materialize occurrences as events within ``[start_date, end_date]``."""
+        return list(self.iter_occurrences(start_date, end_date))
+
+    def iter_occurrences(self, start_date: datetime, end_date: datetime):
+        """Yield occurrences lazily; preferred in loops to avoid the list."""
+        if self.recurrence_rule is None:
+            return
+        occurrence_dates = self.recurrence_rule.between(start_date, end_date, inc=True)
+        for occurrence_dt in occurrence_dates:
+            yield Event(
+                title=self.title,
+                start_time=occurrence_dt,
+                end_time=occurrence_dt + self.duration,
+                description=self.description,
+                id=str(uuid.uuid4()),
+            )
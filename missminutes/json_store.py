@@ -0,0 +1,367 @@
+"""JSON file persistence for tasks and schedules."""
+
+from __future__ import annotations
+
+import bisect
+import json
+import os
+import tempfile
+import threading
+from datetime import datetime, time, timedelta
+from pathlib import Path
+from typing import Iterator, Optional
+
+import ijson
+import orjson
+
+from .basic_scheduler import ScheduledTask
+from .tasks import Session, Task
+from .timeprofile import DayOfWeek, TimeWindow, WeeklySchedule
+
+
+def _write_json(path: Path, payload) -> None:
+    """Serialize with orjson and swap the file into place atomically.
+
+    json.dump with indent falls back to the pure-Python encoder; orjson
+    pretty-prints in C. Writing a uniquely named sibling tmp file (mkstemp,
+    so concurrent writers never share one) and os.replace-ing it keeps
+    readers from ever seeing a partial file.
+    """
+    fd, tmp_name = tempfile.mkstemp(
+        dir=path.parent, prefix=path.name + ".", suffix=".tmp"
+    )
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(orjson.dumps(payload, option=orjson.OPT_INDENT_2))
+        os.replace(tmp_name, path)
+    except BaseException:
+        os.unlink(tmp_name)
+        raise
+
+
+def _parse_time(s: str) -> time:
+    """Parse "HH:MM:SS" directly; strptime recompiles its format per call."""
+    return time(int(s[0:2]), int(s[3:5]), int(s[6:8]))
+
+
+class JsonStore:
+    """Stores tasks, the weekly schedule, and scheduled tasks as JSON files."""
+
+    TASKS_FILE = "tasks.json"
+    SCHEDULE_FILE = "schedule.json"
+    SCHEDULED_TASKS_FILE = "scheduled_tasks.json"
+    SYNC_STATE_FILE = "calendar_sync.json"
+
+    def __init__(self, data_dir: str | Path):
+        self.data_dir = Path(data_dir)
+        self.data_dir.mkdir(parents=True, exist_ok=True)
+        self.tasks_file = self.data_dir / self.TASKS_FILE
+        self.schedule_file = self.data_dir / self.SCHEDULE_FILE
+        self.scheduled_tasks_file = self.data_dir / self.SCHEDULED_TASKS_FILE
+        self.sync_state_file = self.data_dir / self.SYNC_STATE_FILE
+        # Serializes whole read-modify-write sequences across threads (the
+        # flush worker writes event ids back concurrently with CLI
+        # mutations). Reentrant so callers can hold it around a load->save
+        # span while the save_* methods take it themselves.
+        self.write_lock = threading.RLock()
+        # Write-through caches keyed by file mtime (nanoseconds, so rapid
+        # successive writes cannot collide on a coarse timestamp), letting
+        # repeated loads within one invocation skip the disk read and parse.
+        self._lock = threading.Lock()
+        self._tasks_cache: Optional[tuple[int, list[Task]]] = None
+        self._tasks_by_id: Optional[dict[str, Task]] = None
+        self._schedule_cache: Optional[tuple[int, list[TimeWindow]]] = None
+        self._scheduled_cache: Optional[tuple[int, list[ScheduledTask]]] = None
+
+    @staticmethod
+    def _task_to_dict(task: Task) -> dict:
+        return {
+            "id": task.id,
+            "title": task.title,
+            "description": task.description,
+            "duration_seconds": int(task.duration.total_seconds()),
+            "due_date": task.due_date.isoformat() if task.due_date else None,
+            "completed": task.completed,
+            "completed_at": (
+                task.completed_at.isoformat() if task.completed_at else None
+            ),
+            "time_spent_seconds": int(task.time_spent.total_seconds()),
+            "calendar_event_id": task.calendar_event_id,
+        }
+
+    @staticmethod
+    def _task_from_dict(data: dict) -> Task:
+        return Task(
+            title=data["title"],
+            duration=timedelta(seconds=data["duration_seconds"]),
+            due_date=(
+                datetime.fromisoformat(data["due_date"]) if data["due_date"] else None
+            ),
+            description=data.get("description", ""),
+            id=data["id"],
+            completed=data.get("completed", False),
+            completed_at=(
+                datetime.fromisoformat(data["completed_at"])
+                if data.get("completed_at")
+                else None
+            ),
+            time_spent=timedelta(seconds=data.get("time_spent_seconds", 0)),
+            calendar_event_id=data.get("calendar_event_id"),
+        )
+
+    def save_tasks(self, tasks: list[Task]) -> None:
+        tasks_data = [self._task_to_dict(task) for task in tasks]
+        with self.write_lock:
+            _write_json(self.tasks_file, tasks_data)
+            with self._lock:
+                self._tasks_cache = (self.tasks_file.stat().st_mtime_ns, list(tasks))
+                self._tasks_by_id = {task.id: task for task in tasks}
+                # Scheduled tasks embed task objects; force a re-link on next load.
+                self._scheduled_cache = None
+
+    def load_tasks(self) -> list[Task]:
+        if not self.tasks_file.exists():
+            return []
+        mtime = self.tasks_file.stat().st_mtime_ns
+        with self._lock:
+            if self._tasks_cache is not None and self._tasks_cache[0] == mtime:
+                return list(self._tasks_cache[1])
+        with open(self.tasks_file) as f:
+            tasks_data = json.load(f)
+        tasks = [self._task_from_dict(data) for data in tasks_data]
+        with self._lock:
+            self._tasks_cache = (mtime, tasks)
+            self._tasks_by_id = {task.id: task for task in tasks}
+        return list(tasks)
+
+    def get_task(self, task_id: str) -> Optional[Task]:
+        """O(1) task lookup by id, backed by the tasks cache."""
+        self.load_tasks()
+        with self._lock:
+            if self._tasks_by_id is None:
+                return None
+            return self._tasks_by_id.get(task_id)
+
+    def save_schedule(self, schedule: WeeklySchedule) -> None:
+        schedule_data = [
+            {
+                "day": window.day.value,
+                "start_time": window.start_time.strftime("%H:%M:%S"),
+                "end_time": window.end_time.strftime("%H:%M:%S"),
+            }
+            for window in schedule.windows
+        ]
+        with self.write_lock:
+            _write_json(self.schedule_file, schedule_data)
+            with self._lock:
+                self._schedule_cache = (
+                    self.schedule_file.stat().st_mtime_ns,
+                    list(schedule.windows),
+                )
+
+    def load_schedule(self) -> WeeklySchedule:
+        if not self.schedule_file.exists():
+            return WeeklySchedule()
+        mtime = self.schedule_file.stat().st_mtime_ns
+        with self._lock:
+            if self._schedule_cache is not None and self._schedule_cache[0] == mtime:
+                return WeeklySchedule(windows=list(self._schedule_cache[1]))
+        with open(self.schedule_file) as f:
+            schedule_data = json.load(f)
+        windows = [
+            TimeWindow(
+                DayOfWeek(data["day"]),
+                _parse_time(data["start_time"]),
+                _parse_time(data["end_time"]),
+            )
+            for data in schedule_data
+        ]
+        with self._lock:
+            self._schedule_cache = (mtime, windows)
+        return WeeklySchedule(windows=list(windows))
+
+    def save_scheduled_tasks(self, scheduled_tasks: list[ScheduledTask]) -> None:
+        scheduled_data = [
+            {
+                "task_id": st.task.id,
+                "start_time": st.start_time.isoformat(),
+                "end_time": st.end_time.isoformat(),
+            }
+            for st in scheduled_tasks
+        ]
+        with self.write_lock:
+            _write_json(self.scheduled_tasks_file, scheduled_data)
+            with self._lock:
+                self._scheduled_cache = (
+                    self.scheduled_tasks_file.stat().st_mtime_ns,
+                    list(scheduled_tasks),
+                )
+
+    def load_synced_state(self) -> dict[str, tuple[datetime, str, timedelta]]:
+        """Per-task (start_time, title, duration) last acknowledged by the calendar.
+
+        Written only after the API accepts a mutation, so diffing the next
+        schedule against it re-queues anything a failed batch left stale.
+        Tasks absent from the record are treated by callers as never synced.
+        """
+        if not self.sync_state_file.exists():
+            return {}
+        with open(self.sync_state_file) as f:
+            sync_data = json.load(f)
+        return {
+            task_id: (
+                datetime.fromisoformat(entry["start_time"]),
+                entry["title"],
+                timedelta(seconds=entry["duration_seconds"]),
+            )
+            for task_id, entry in sync_data.items()
+        }
+
+    def save_synced_state(
+        self, state: dict[str, tuple[datetime, str, timedelta]]
+    ) -> None:
+        sync_data = {
+            task_id: {
+                "start_time": start_time.isoformat(),
+                "title": title,
+                "duration_seconds": int(duration.total_seconds()),
+            }
+            for task_id, (start_time, title, duration) in state.items()
+        }
+        with self.write_lock:
+            _write_json(self.sync_state_file, sync_data)
+
+    def load_scheduled_tasks(self) -> list[ScheduledTask]:
+        if not self.scheduled_tasks_file.exists():
+            return []
+        mtime = self.scheduled_tasks_file.stat().st_mtime_ns
+        with self._lock:
+            if self._scheduled_cache is not None and self._scheduled_cache[0] == mtime:
+                return list(self._scheduled_cache[1])
+        # Reuse the id index maintained by load_tasks instead of building
+        # a fresh dict from the task list on every call.
+        self.load_tasks()
+        with self._lock:
+            tasks_by_id = self._tasks_by_id or {}
+        with open(self.scheduled_tasks_file) as f:
+            scheduled_data = json.load(f)
+        scheduled = []
+        for data in scheduled_data:
+            task = tasks_by_id.get(data["task_id"])
+            if task is None:
+                continue
+            scheduled.append(
+                ScheduledTask(
+                    task,
+                    datetime.fromisoformat(data["start_time"]),
+                    datetime.fromisoformat(data["end_time"]),
+                )
+            )
+        with self._lock:
+            self._scheduled_cache = (mtime, scheduled)
+        return list(scheduled)
+
+
+class SessionStore:
+    """Stores work sessions as JSON, indexed by start time for range queries."""
+
+    SESSIONS_FILE = "sessions.json"
+
+    def __init__(self, data_dir: str | Path):
+        self.data_dir = Path(data_dir)
+        self.data_dir.mkdir(parents=True, exist_ok=True)
+        self.sessions_file = self.data_dir / self.SESSIONS_FILE
+        self._sessions: Optional[dict[str, Session]] = None
+        # Sorted (start_time, session_id) pairs over ``_sessions``, so range
+        # queries bisect instead of scanning and sorting every session.
+        self._index: list[tuple[datetime, str]] = []
+
+    @staticmethod
+    def _session_to_dict(session: Session) -> dict:
+        return {
+            "id": session.id,
+            "task_id": session.task_id,
+            "start_time": session.start_time.isoformat(),
+            "end_time": session.end_time.isoformat(),
+            "completed": session.completed,
+        }
+
+    @staticmethod
+    def _session_from_dict(data: dict) -> Session:
+        return Session(
+            id=data["id"],
+            task_id=data["task_id"],
+            start_time=datetime.fromisoformat(data["start_time"]),
+            end_time=datetime.fromisoformat(data["end_time"]),
+            completed=data.get("completed", False),
+        )
+
+    def _load(self) -> dict[str, Session]:
+        if self._sessions is None:
+            if self.sessions_file.exists():
+                with open(self.sessions_file) as f:
+                    sessions_data = json.load(f)
+                sessions = [self._session_from_dict(data) for data in sessions_data]
+            else:
+                sessions = []
+            self._sessions = {session.id: session for session in sessions}
+            self._index = sorted(
+                (session.start_time, session.id) for session in sessions
+            )
+        return self._sessions
+
+    def _flush(self) -> None:
+        sessions_data = [
+            self._session_to_dict(self._sessions[session_id])
+            for _, session_id in self._index
+        ]
+        with open(self.sessions_file, "w") as f:
+            json.dump(sessions_data, f, indent=2)
+
+    def save_session(self, session: Session) -> None:
+        sessions = self._load()
+        old = sessions.get(session.id)
+        if old is not None:
+            self._index.remove((old.start_time, old.id))
+        sessions[session.id] = session
+        bisect.insort(self._index, (session.start_time, session.id))
+        self._flush()
+
+    def get_session(self, session_id: str) -> Optional[Session]:
+        return self._load().get(session_id)
+
+    def get_all_sessions(self) -> list[Session]:
+        sessions = self._load()
+        return [sessions[session_id] for _, session_id in self._index]
+
+    def get_sessions_in_range(
+        self, start: datetime, end: datetime
+    ) -> list[Session]:
+        """Sessions starting in ``[start, end)``, ordered by start time.
+
+        Bisects the start-time index, so the cost is O(log N + K) for K
+        results rather than a scan and sort of every stored session.
+        """
+        sessions = self._load()
+        lo = bisect.bisect_left(self._index, (start,))
+        hi = bisect.bisect_left(self._index, (end,))
+        return [sessions[session_id] for _, session_id in self._index[lo:hi]]
+
+    def iter_sessions_in_range(
+        self, start: datetime, end: datetime
+    ) -> Iterator[Session]:
+        """Like :meth:`get_sessions_in_range`, but streaming.
+
+        Once sessions are cached this serves from the index; on a cold start
+        it stream-parses ``sessions.json`` with ijson so sessions outside the
+        range are never materialized, keeping peak memory at O(results).
+        """
+        if self._sessions is not None:
+            yield from self.get_sessions_in_range(start, end)
+            return
+        if not self.sessions_file.exists():
+            return
+        with open(self.sessions_file, "rb") as f:
+            for data in ijson.items(f, "item"):
+                if start <= datetime.fromisoformat(data["start_time"]) < end:
+                    yield self._session_from_dict(data)
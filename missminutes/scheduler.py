@@ -0,0 +1,173 @@
+"""Time-domain scheduler that places task sessions into available time."""
+
+from __future__ import annotations
+
+import bisect
+import heapq
+import uuid
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+from .events import Event, RecurringEvent
+from .tasks import RecurringTask, Session, Task
+from .timedomain import TimeDomain, TimeSlot
+
+
+class SchedulingError(Exception):
+    """Raised when a task cannot be fit into the available time."""
+
+
+# Breather kept around split sessions so they don't run back to back.
+SESSION_BUFFER = timedelta(minutes=30)
+NO_BUFFER = timedelta(0)
+
+
+class Scheduler:
+    """Schedules tasks into sessions around events, using time domains."""
+
+    DEFAULT_HORIZON_DAYS = 30
+
+    def __init__(self, horizon_days: int = DEFAULT_HORIZON_DAYS) -> None:
+        self.horizon_days = horizon_days
+        self.tasks: dict[str, Task] = {}
+        self.events: dict[str, Event] = {}
+        # Events sorted by start time, with a parallel list of start times
+        # so get_events can bisect instead of scanning every event.
+        self._events_sorted: list[Event] = []
+        self._event_starts: list[datetime] = []
+        # Maintained in start-time order: schedule() sorts once after placing
+        # all tasks, and _schedule_task emits each task's sessions in order.
+        self.sessions: list[Session] = []
+        # Session ids only need to be unique per scheduler; a single random
+        # prefix plus a counter is far cheaper than a uuid4 per session.
+        self._session_prefix = uuid.uuid4().hex[:8]
+        self._session_counter = 0
+
+    def add_task(self, task: Task) -> None:
+        """Register a task, expanding recurring tasks over the horizon."""
+        if isinstance(task, RecurringTask) and task.recurrence_rule is not None:
+            start = datetime.now()
+            end = start + timedelta(days=self.horizon_days)
+            self.tasks.update(
+                (occurrence.id, occurrence)
+                for occurrence in task.iter_occurrences(start, end)
+            )
+        else:
+            self.tasks[task.id] = task
+
+    def add_event(self, event: Event) -> None:
+        """Register an event, expanding recurring events over the horizon."""
+        if isinstance(event, RecurringEvent) and event.recurrence_rule is not None:
+            start = datetime.now()
+            end = start + timedelta(days=self.horizon_days)
+            for occurrence in event.iter_occurrences(start, end):
+                self.events[occurrence.id] = occurrence
+                self._index_event(occurrence)
+        else:
+            self.events[event.id] = event
+            self._index_event(event)
+
+    def _index_event(self, event: Event) -> None:
+        i = bisect.bisect_right(self._event_starts, event.start_time)
+        self._event_starts.insert(i, event.start_time)
+        self._events_sorted.insert(i, event)
+
+    def get_events(self, start_date: datetime, end_date: datetime) -> list[Event]:
+        """All events that overlap ``[start_date, end_date]``."""
+        hi = bisect.bisect_right(self._event_starts, end_date)
+        return [
+            event
+            for event in self._events_sorted[:hi]
+            if event.end_time >= start_date
+        ]
+
+    def apply_scheduled_constraints(
+        self, time_domain: TimeDomain, start_date: datetime, end_date: datetime
+    ) -> TimeDomain:
+        """Subtract events and already-placed sessions from a time domain."""
+        # Collect every blocked span into one domain first (add_slot merges
+        # overlaps), then remove them all in a single sorted sweep instead
+        # of rescanning the domain once per event and session.
+        blocked = TimeDomain()
+        for event in self.get_events(start_date, end_date):
+            blocked.add_slot(event.start_time, event.end_time)
+        for session in self.sessions:
+            blocked.add_slot(session.start_time, session.end_time)
+        return time_domain.subtract(blocked)
+
+    def schedule(self, start_date: datetime | None = None, days: int | None = None) -> list[Session]:
+        """Place sessions for every pending task, earliest due date first."""
+        if start_date is None:
+            start_date = datetime.now()
+        if days is None:
+            days = self.horizon_days
+        end_date = start_date + timedelta(days=days)
+        self.sessions = []
+        pending = [task for task in self.tasks.values() if not task.completed]
+        pending.sort(key=lambda t: (t.due_date is None, t.due_date))
+        for task in pending:
+            domain = task.project_time_domain(start_date, days)
+            domain = self.apply_scheduled_constraints(domain, start_date, end_date)
+            self.sessions.extend(self._schedule_task(task, domain))
+        self.sessions.sort(key=lambda s: s.start_time)
+        return self.sessions
+
+    def _schedule_task(self, task: Task, available_domain: TimeDomain) -> list[Session]:
+        """Greedily place sessions for one task into the earliest free slots."""
+        remaining = task.duration
+        sessions: list[Session] = []
+        while remaining > timedelta(0):
+            slot = available_domain.get_earliest_slot()
+            if slot is None:
+                raise SchedulingError(f"No available time for task '{task.title}'")
+            chunk = min(remaining, slot.duration)
+            if task.max_session_length is not None:
+                chunk = min(chunk, task.max_session_length)
+            session = Session(
+                id=f"{self._session_prefix}-{self._session_counter:x}",
+                task_id=task.id,
+                start_time=slot.start,
+                end_time=slot.start + chunk,
+            )
+            self._session_counter += 1
+            sessions.append(session)
+            remaining -= chunk
+            # Fold the buffer offsets straight into the subtracted bounds
+            # rather than building a separate padded slot per branch.
+            buffer = SESSION_BUFFER if task.max_session_length is not None else NO_BUFFER
+            available_domain.subtract_slot(
+                TimeSlot(session.start_time - buffer, session.end_time + buffer)
+            )
+        return sessions
+
+    def print_schedule(self, start_date: datetime, days: int = 7) -> str:
+        """Render the schedule for ``days`` days as text, one block per day."""
+        end_date = start_date + timedelta(days=days)
+        titles = {task_id: task.title for task_id, task in self.tasks.items()}
+        # Sessions are kept sorted by start time (see __init__), so a single
+        # heap-merge with the pre-sorted events yields everything in order
+        # with no per-day sorting.
+        sessions_in_range = (
+            (s.start_time, s.end_time, titles.get(s.task_id, "(unknown task)"))
+            for s in self.sessions
+            if start_date <= s.start_time < end_date
+        )
+        events_in_range = sorted(
+            self.get_events(start_date, end_date), key=lambda e: e.start_time
+        )
+        entries = heapq.merge(
+            sessions_in_range,
+            ((e.start_time, e.end_time, e.title) for e in events_in_range),
+        )
+        schedule_by_day: dict = defaultdict(list)
+        for start, end, title in entries:
+            schedule_by_day[start.date()].append(
+                f"{start:%H:%M}-{end:%H:%M}  {title}"
+            )
+        lines = []
+        for i in range(days):
+            day = (start_date + timedelta(days=i)).date()
+            lines.append(f"{day:%A %Y-%m-%d}")
+            for entry in schedule_by_day[day]:
+                lines.append(f"  {entry}")
+        return "\n".join(lines)
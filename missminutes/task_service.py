@@ -0,0 +1,291 @@
+"""High-level task operations tying storage, scheduling, and the calendar."""
+
+from __future__ import annotations
+
+import queue
+import sys
+import threading
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Optional
+
+from .basic_scheduler import BasicScheduler, ScheduledTask
+from .calendar_service import CalendarService
+from .json_store import JsonStore
+from .scheduler import SchedulingError
+from .tasks import Task
+
+DEFAULT_DATA_DIR = Path.home() / ".local" / "share" / "missminutes"
+
+
+class TaskService:
+    """Coordinates the store, the scheduler, and Google Calendar sync.
+
+    ``calendar_service`` may be ``None`` for offline use; calendar sync is
+    then skipped entirely.
+    """
+
+    # Queued calendar mutations are sent once a full batch accumulates or
+    # this many seconds elapse, whichever comes first.
+    CALENDAR_MAX_WAIT = 2.0
+
+    def __init__(
+        self,
+        store: Optional[JsonStore] = None,
+        calendar_service: Optional[CalendarService] = None,
+    ):
+        self.store = store if store is not None else JsonStore(DEFAULT_DATA_DIR)
+        self.calendar = calendar_service
+        self._scheduler: Optional[BasicScheduler] = None
+        # Last schedule keyed by task id, with the scheduling inputs it was
+        # computed from, so mutations only reschedule the tasks that changed.
+        self._last_scheduled: dict[
+            str, tuple[ScheduledTask, timedelta, Optional[datetime]]
+        ] = {}
+        self._calendar_queue: queue.Queue = queue.Queue()
+        self._calendar_thread: Optional[threading.Thread] = None
+
+    @property
+    def scheduler(self) -> BasicScheduler:
+        if self._scheduler is None:
+            self._scheduler = BasicScheduler(self.store.load_schedule())
+        return self._scheduler
+
+    def add_task(self, task: Task) -> Task:
+        # The write lock spans the whole load->mutate->save sequence so the
+        # flush worker's event-id write-back can't interleave and drop it.
+        with self.store.write_lock:
+            tasks = self.store.load_tasks()
+            tasks.append(task)
+            self.store.save_tasks(tasks)
+            self._schedule_tasks()
+        return task
+
+    def update_task(self, task_id: str, **changes) -> Task:
+        with self.store.write_lock:
+            tasks = self.store.load_tasks()
+            task = self.store.get_task(task_id)
+            if task is None:
+                raise KeyError(f"No task with id {task_id}")
+            for name, value in changes.items():
+                setattr(task, name, value)
+            self.store.save_tasks(tasks)
+            self._schedule_tasks()
+        return task
+
+    def complete_task(self, task_id: str) -> Task:
+        with self.store.write_lock:
+            tasks = self.store.load_tasks()
+            task = self.store.get_task(task_id)
+            if task is None:
+                raise KeyError(f"No task with id {task_id}")
+            task.mark_complete()
+            self.store.save_tasks(tasks)
+            self._schedule_tasks()
+        return task
+
+    def delete_task(self, task_id: str) -> None:
+        with self.store.write_lock:
+            tasks = self.store.load_tasks()
+            task = self.store.get_task(task_id)
+            if task is None:
+                raise KeyError(f"No task with id {task_id}")
+            if task.calendar_event_id and self.calendar is not None:
+                self.calendar.delete_event(task.calendar_event_id)
+            tasks.remove(task)
+            self.store.save_tasks(tasks)
+            self._schedule_tasks()
+
+    def get_all_tasks(self) -> list[Task]:
+        return self.store.load_tasks()
+
+    def get_schedule(self) -> list[ScheduledTask]:
+        return self.store.load_scheduled_tasks()
+
+    def _schedule_tasks(self) -> None:
+        """Recompute the schedule and mirror it to the calendar in one batch."""
+        all_tasks = self.store.load_tasks()
+        pending = [task for task in all_tasks if not task.completed]
+        # Diff against what the calendar last *acknowledged* (maintained by
+        # the flush worker), so edits and failed batches alike show up as
+        # out of sync and get re-queued.
+        previous = self.store.load_synced_state()
+        # Keep entries whose scheduling inputs are unchanged and run the
+        # scheduler only over the delta, placing it around the kept entries.
+        kept: list[ScheduledTask] = []
+        delta: list[Task] = []
+        for task in pending:
+            entry = self._last_scheduled.get(task.id)
+            if entry is not None and entry[1:] == (task.duration, task.due_date):
+                kept.append(ScheduledTask(task, entry[0].start_time, entry[0].end_time))
+            else:
+                delta.append(task)
+        self._scheduler = None
+        try:
+            newly_scheduled = (
+                self.scheduler.schedule_tasks(
+                    delta, date.today(), existing_scheduled_tasks=kept
+                )
+                if delta
+                else []
+            )
+        except SchedulingError:
+            # Pinned entries can block a schedule that is solvable when
+            # everything moves (e.g. an urgent task needs a slot a kept
+            # entry occupies). Retry from scratch before giving up.
+            kept = []
+            newly_scheduled = self.scheduler.schedule_tasks(pending, date.today())
+        scheduled = sorted(kept + newly_scheduled, key=lambda st: st.start_time)
+        self._last_scheduled = {
+            st.task.id: (st, st.task.duration, st.task.due_date) for st in scheduled
+        }
+        self.store.save_scheduled_tasks(scheduled)
+        if self.calendar is None:
+            return
+
+        # Queue every mutation for the background flush thread, so task
+        # operations return without waiting on calendar round trips.
+        scheduled_ids = {st.task.id for st in scheduled}
+        for task in all_tasks:
+            if task.calendar_event_id and task.id not in scheduled_ids:
+                self._calendar_queue.put(("delete", task, None))
+        for st in scheduled:
+            if not st.task.calendar_event_id:
+                self._calendar_queue.put(("create", st.task, st.start_time))
+            elif previous.get(st.task.id) != (
+                st.start_time,
+                st.task.title,
+                st.task.duration,
+            ):
+                self._calendar_queue.put(("update", st.task, st.start_time))
+            # Entries whose time, title, and duration are unchanged need no
+            # calendar call at all.
+        self._ensure_flush_thread()
+
+    def _ensure_flush_thread(self) -> None:
+        if self._calendar_thread is None or not self._calendar_thread.is_alive():
+            self._calendar_thread = threading.Thread(
+                target=self._calendar_worker, daemon=True
+            )
+            self._calendar_thread.start()
+
+    def _calendar_worker(self) -> None:
+        """Coalesce queued mutations: flush on a full batch or after max-wait."""
+        while True:
+            operations = [self._calendar_queue.get()]
+            deadline = time.monotonic() + self.CALENDAR_MAX_WAIT
+            while len(operations) < CalendarService.BATCH_LIMIT:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    operations.append(self._calendar_queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            try:
+                self._flush_calendar_ops(operations)
+            except Exception as exc:
+                # Drop this batch but keep the worker alive; the next
+                # reschedule re-queues anything still out of sync.
+                print(f"calendar sync failed: {exc}", file=sys.stderr)
+            finally:
+                for _ in operations:
+                    self._calendar_queue.task_done()
+
+    def _flush_calendar_ops(
+        self, operations: list[tuple[str, Task, Optional[datetime]]]
+    ) -> None:
+        # Coalesce to the latest op per task: the queue can hold successive
+        # rounds for one task, and batch request ids must be unique.
+        ops_by_id = {task.id: (op, task, start_time) for op, task, start_time in operations}
+        # What the calendar acknowledged this flush: the synced tuple for
+        # creates/updates, None for deletes. Task state and the durable
+        # sync record change only here, in the response callback, so a
+        # failed batch leaves both untouched and the next reschedule's
+        # diff re-queues the operation.
+        acked: dict[str, Optional[tuple[datetime, str, timedelta]]] = {}
+        changed = False
+
+        def on_response(request_id, response, exception):
+            nonlocal changed
+            if exception is not None:
+                return
+            op, task, start_time = ops_by_id[request_id]
+            if op == "delete":
+                task.calendar_event_id = None
+                acked[task.id] = None
+                changed = True
+            else:
+                acked[task.id] = (start_time, task.title, task.duration)
+                if response is not None and response.get("id") != task.calendar_event_id:
+                    task.calendar_event_id = response["id"]
+                    changed = True
+
+        pending = list(ops_by_id.values())
+        for chunk_start in range(0, len(pending), CalendarService.BATCH_LIMIT):
+            batch = self.calendar.new_batch(on_response)
+            for op, task, start_time in pending[
+                chunk_start : chunk_start + CalendarService.BATCH_LIMIT
+            ]:
+                if op == "delete":
+                    self.calendar.delete_event(
+                        task.calendar_event_id, batch=batch, request_id=task.id
+                    )
+                elif op == "update":
+                    self.calendar.update_event(
+                        task.calendar_event_id, task, start_time, batch=batch
+                    )
+                else:
+                    self.calendar.create_event(task, start_time, batch=batch)
+            batch.execute()
+        # All network work is done; take the write lock only for the two
+        # read-modify-write persistence passes so a concurrent CLI mutation
+        # can't be lost between our load and save.
+        with self.store.write_lock:
+            if acked:
+                synced = self.store.load_synced_state()
+                for task_id, entry in acked.items():
+                    if entry is None:
+                        synced.pop(task_id, None)
+                    else:
+                        synced[task_id] = entry
+                self.store.save_synced_state(synced)
+            if changed:
+                stored = self.store.load_tasks()
+                stored_by_id = {task.id: task for task in stored}
+                for _, task, _ in ops_by_id.values():
+                    match = stored_by_id.get(task.id)
+                    if match is not None:
+                        match.calendar_event_id = task.calendar_event_id
+                self.store.save_tasks(stored)
+
+    def flush_calendar(self) -> None:
+        """Block until every queued calendar mutation has been sent."""
+        self._calendar_queue.join()
+
+    def sync_calendar(self) -> int:
+        """Pull event ids back from the calendar into matching tasks."""
+        if self.calendar is None:
+            return 0
+        # Fetch before taking the lock; only the load->reconcile->save span
+        # needs to exclude concurrent store writers, and the per-event work
+        # is plain dict lookups with nothing to parallelize.
+        events = self.calendar.get_all_events()
+        with self.store.write_lock:
+            tasks = self.store.load_tasks()
+            tasks_by_id = {task.id: task for task in tasks}
+            synced = 0
+            for event in events:
+                task_id = (
+                    event.get("extendedProperties", {})
+                    .get("private", {})
+                    .get("task_id")
+                )
+                task = tasks_by_id.get(task_id)
+                if task is not None and task.calendar_event_id != event["id"]:
+                    task.calendar_event_id = event["id"]
+                    synced += 1
+            if synced:
+                self.store.save_tasks(tasks)
+        return synced
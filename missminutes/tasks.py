@@ -0,0 +1,831 @@
+"""Tasks, recurring tasks, and the relationships between them."""
+
+from __future__ import annotations
+
+import copy
+import os
+import uuid
+from collections import deque
+from collections.abc import MutableMapping, MutableSequence
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from functools import lru_cache, partial
+from itertools import islice
+
+import numpy as np
+from datetime import datetime, timedelta
+from enum import Enum, auto
+from typing import Iterator, Optional, Union
+
+from dateutil.rrule import (
+    DAILY,
+    MONTHLY,
+    WEEKLY,
+    YEARLY,
+    FR,
+    MO,
+    SA,
+    SU,
+    TH,
+    TU,
+    WE,
+    rrule,
+)
+
+from .timedomain import TimeDomain
+from .timeprofile import TimeProfile
+
+
+class RecurrencePattern(Enum):
+    """How a recurring task repeats."""
+
+    DAILY = auto()
+    WEEKLY = auto()
+    MONTHLY = auto()
+    YEARLY = auto()
+    CUSTOM = auto()
+
+
+class DependencyType(Enum):
+    """How one task relates to another in time."""
+
+    BEFORE = auto()
+    AFTER = auto()
+    DURING = auto()
+    CONTAINS = auto()
+    CONCURRENT = auto()
+
+
+# Recurrence patterns mapped onto dateutil frequencies, and weekday
+# numbers (Monday = 0) onto dateutil weekday constants.
+_FREQ_MAP = {
+    RecurrencePattern.DAILY: DAILY,
+    RecurrencePattern.WEEKLY: WEEKLY,
+    RecurrencePattern.MONTHLY: MONTHLY,
+    RecurrencePattern.YEARLY: YEARLY,
+}
+_WEEKDAY_MAP = (MO, TU, WE, TH, FR, SA, SU)
+
+def _batch_uuid4(n: int) -> list[str]:
+    """``n`` UUID4 strings drawn from a single urandom read.
+
+    One syscall supplies the randomness for the whole batch instead of one
+    per id, which matters when materializing many occurrences at once.
+    """
+    raw = os.urandom(16 * n)
+    return [
+        str(uuid.UUID(bytes=raw[i : i + 16], version=4))
+        for i in range(0, 16 * n, 16)
+    ]
+
+
+# Shared defaults for timedelta fields; timedelta is immutable, so one
+# instance can back every Task instead of a factory allocation apiece.
+_ZERO_DELTA = timedelta(0)
+_ONE_HOUR = timedelta(hours=1)
+
+
+@lru_cache(maxsize=256)
+def _day_bounds(date_ordinal: int, days: int) -> tuple[datetime, datetime]:
+    """Midnight bounds of a ``days``-day period starting on the ordinal date."""
+    period_start = datetime.fromordinal(date_ordinal)
+    return period_start, period_start + timedelta(days=days)
+
+
+# Bumped on every dependency edge added, so graph indexes can detect
+# that they are stale without subscribing to individual tasks.
+_dep_version = 0
+
+# How a dependency looks from the other task's side.
+_INVERSE_DEP: dict[DependencyType, DependencyType] = {
+    DependencyType.BEFORE: DependencyType.AFTER,
+    DependencyType.AFTER: DependencyType.BEFORE,
+    DependencyType.DURING: DependencyType.CONTAINS,
+    DependencyType.CONTAINS: DependencyType.DURING,
+    DependencyType.CONCURRENT: DependencyType.CONCURRENT,
+}
+
+
+@dataclass(slots=True, eq=False)
+class Tag:
+    """A label attached to tasks for grouping and filtering.
+
+    Identity is the id alone; ``eq=False`` keeps the manual ``__eq__`` and
+    ``__hash__`` below, and ``slots`` drops the per-instance ``__dict__``.
+    """
+
+    name: str
+    id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    color: Optional[str] = None
+    # The id never changes, so the hash is computed once at construction
+    # instead of on every set or dict operation.
+    _hash: int = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self._hash = hash(self.id)
+
+    def __eq__(self, other):
+        return isinstance(other, Tag) and other.id == self.id
+
+    def __hash__(self):
+        return self._hash
+
+
+@dataclass(slots=True)
+class Session:
+    """A concrete block of scheduled work toward a task."""
+
+    id: str
+    task_id: str
+    start_time: datetime
+    end_time: datetime
+    completed: bool = False
+
+    @property
+    def duration(self) -> timedelta:
+        return self.end_time - self.start_time
+
+
+class CowDict(MutableMapping):
+    """Dict wrapper that clones its backing dict on the first write.
+
+    Cloned tasks share profile and dependency collections until one of
+    them mutates, so materializing many read-only clones never copies the
+    contents.
+    """
+
+    __slots__ = ("_d", "_shared")
+
+    def __init__(self, backing: dict):
+        self._d = backing
+        self._shared = True
+
+    def _own(self) -> None:
+        if self._shared:
+            self._d = dict(self._d)
+            self._shared = False
+
+    def __getitem__(self, key):
+        return self._d[key]
+
+    def __setitem__(self, key, value):
+        self._own()
+        self._d[key] = value
+
+    def __delitem__(self, key):
+        self._own()
+        del self._d[key]
+
+    def __iter__(self):
+        return iter(self._d)
+
+    def __len__(self):
+        return len(self._d)
+
+    def __reduce__(self):
+        return (type(self), (dict(self._d),))
+
+
+class CowList(MutableSequence):
+    """List wrapper that clones its backing list on the first write."""
+
+    __slots__ = ("_l", "_shared")
+
+    def __init__(self, backing: list):
+        self._l = backing
+        self._shared = True
+
+    def _own(self) -> None:
+        if self._shared:
+            self._l = list(self._l)
+            self._shared = False
+
+    def __getitem__(self, index):
+        return self._l[index]
+
+    def __setitem__(self, index, value):
+        self._own()
+        self._l[index] = value
+
+    def __delitem__(self, index):
+        self._own()
+        del self._l[index]
+
+    def __len__(self):
+        return len(self._l)
+
+    def insert(self, index, value):
+        self._own()
+        self._l.insert(index, value)
+
+    def copy(self) -> list:
+        return list(self._l)
+
+    def __reduce__(self):
+        return (type(self), (list(self._l),))
+
+
+class TaskIndex:
+    """Process-wide mapping from task id strings to dense integers.
+
+    Dependency edges are keyed by these integers rather than the 36-char
+    UUID strings: int keys hash faster and cost a fraction of the memory
+    per edge. The string id remains the external API; indices are only
+    used on the dependency-traversal boundary.
+    """
+
+    _by_id: dict[str, int] = {}
+    _ids: list[str] = []
+
+    @classmethod
+    def ix(cls, task_id: str) -> int:
+        ix = cls._by_id.get(task_id)
+        if ix is None:
+            ix = len(cls._ids)
+            cls._by_id[task_id] = ix
+            cls._ids.append(task_id)
+        return ix
+
+    @classmethod
+    def id_for(cls, ix: int) -> str:
+        return cls._ids[ix]
+
+
+@dataclass(slots=True)
+class Task:
+    """A unit of work with a duration, a deadline, and scheduling constraints."""
+
+    title: str
+    duration: timedelta = _ONE_HOUR
+    due_date: Optional[datetime] = None
+    description: str = ""
+    id: Optional[str] = None
+    starts_at: Optional[datetime] = None
+    completed: bool = False
+    completed_at: Optional[datetime] = None
+    time_spent: timedelta = _ZERO_DELTA
+    buffer_before: timedelta = _ZERO_DELTA
+    buffer_after: timedelta = _ZERO_DELTA
+    max_session_length: Optional[timedelta] = None
+    min_session_length: Optional[timedelta] = None
+    time_profiles: list[TimeProfile] = field(default_factory=list)
+    # Keyed by TaskIndex integers, not id strings; see TaskIndex.
+    dependencies: dict[int, DependencyType] = field(default_factory=dict)
+    dependents: dict[int, DependencyType] = field(default_factory=dict)
+    subtask_ids: list[str] = field(default_factory=list)
+    sessions: list[str] = field(default_factory=list)
+    parent_id: Optional[str] = None
+    calendar_event_id: Optional[str] = None
+    tags: set[Tag] = field(default_factory=set)
+    _total_duration_cache: Optional[timedelta] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    def __post_init__(self):
+        if self.id is None:
+            self.id = str(uuid.uuid4())
+
+    def __setattr__(self, name, value):
+        # Writes to any total_duration input drop the memoized sum.
+        if name in ("duration", "buffer_before", "buffer_after"):
+            object.__setattr__(self, "_total_duration_cache", None)
+        object.__setattr__(self, name, value)
+
+    @property
+    def total_duration(self) -> timedelta:
+        """Duration including the buffers scheduled around the task."""
+        cached = self._total_duration_cache
+        if cached is None:
+            cached = self.duration + self.buffer_before + self.buffer_after
+            self._total_duration_cache = cached
+        return cached
+
+    @property
+    def remaining_duration(self) -> timedelta:
+        return max(self.duration - self.time_spent, timedelta(0))
+
+    def mark_complete(self) -> None:
+        self.completed = True
+        self.completed_at = datetime.now()
+
+    def mark_incomplete(self) -> None:
+        self.completed = False
+        self.completed_at = None
+
+    def add_tag(self, tag: Tag) -> None:
+        self.tags.add(tag)
+
+    def add_time_profile(self, profile: TimeProfile) -> None:
+        self.time_profiles.append(profile)
+
+    def add_dependency(
+        self, entity: Union[Task, object], dep_type: DependencyType
+    ) -> None:
+        """Record that this task depends on ``entity``, and the inverse link."""
+        global _dep_version
+        self.dependencies[TaskIndex.ix(entity.id)] = dep_type
+        if isinstance(entity, Task):
+            entity.dependents[TaskIndex.ix(self.id)] = _INVERSE_DEP[dep_type]
+        _dep_version += 1
+
+    def project_time_domain(self, start_date: datetime, days: int) -> TimeDomain:
+        """Compute the time domain in which this task may be scheduled."""
+        period_start, period_end = _day_bounds(start_date.toordinal(), days)
+        if not self.time_profiles:
+            result = TimeDomain()
+            result.add_slot(period_start, period_end)
+        else:
+            profile_domains = [
+                TimeDomain.from_time_profile(profile, period_start, days)
+                for profile in self.time_profiles
+            ]
+            result = profile_domains[0].intersect_many(profile_domains[1:])
+            # Over-constrained tasks can intersect to nothing; no point
+            # trimming an empty domain.
+            if not result:
+                return result
+        if self.starts_at is not None:
+            result.trim_left(self.starts_at)
+        if self.due_date is not None:
+            result.trim_right(self.due_date)
+        return result
+
+
+@dataclass(slots=True)
+class RecurringTask(Task):
+    """A task template that repeats on a recurrence rule.
+
+    Each occurrence materializes as a plain :class:`Task` whose due date is the
+    start of the following occurrence.
+    """
+
+    recurrence_pattern: Optional[RecurrencePattern] = None
+    recurrence_start: Optional[datetime] = None
+    recurrence_rule: Optional[rrule] = field(default=None, repr=False, compare=False)
+    # Occurrence dates memoized by query window; cleared by set_recurrence.
+    _occurrence_cache: dict = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+
+    def set_recurrence(
+        self,
+        pattern: RecurrencePattern,
+        interval: int = 1,
+        byweekday: Optional[list[int]] = None,
+        bymonthday: Optional[list[int]] = None,
+        until: Optional[datetime] = None,
+        count: Optional[int] = None,
+    ) -> None:
+        """Configure the recurrence rule from a pattern and rrule options."""
+        if self.recurrence_start is None:
+            self.recurrence_start = datetime.now()
+        freq = _FREQ_MAP.get(pattern)
+        if freq is None:
+            raise ValueError(f"Cannot build a rule for pattern {pattern}")
+        weekdays = (
+            [_WEEKDAY_MAP[d] for d in byweekday if 0 <= d <= 6]
+            if byweekday
+            else None
+        )
+        self.recurrence_pattern = pattern
+        # cache=True makes dateutil remember generated occurrences, so
+        # repeated between()/after() calls do not re-iterate from dtstart.
+        self.recurrence_rule = rrule(
+            freq,
+            dtstart=self.recurrence_start,
+            interval=interval,
+            byweekday=weekdays,
+            bymonthday=bymonthday,
+            until=until,
+            count=count,
+            cache=True,
+        )
+        self._occurrence_cache.clear()
+
+    def _clamped_rule(self, effective_start: datetime) -> rrule:
+        """The recurrence rule, with dtstart advanced near ``effective_start``.
+
+        dateutil iterates every occurrence from dtstart forward, so queries
+        far into a long-running series pay for the whole skipped history.
+        For fixed-period frequencies the new dtstart is aligned to a whole
+        number of periods to preserve the phase of the series; count-bounded
+        or calendar-period rules are returned unchanged.
+        """
+        rule = self.recurrence_rule
+        freq_days = {DAILY: 1, WEEKLY: 7}.get(rule._freq)
+        if (
+            freq_days is None
+            or rule._count is not None
+            or effective_start <= self.recurrence_start
+        ):
+            return rule
+        period = timedelta(days=freq_days * rule._interval)
+        periods_done = (effective_start - self.recurrence_start) // period
+        if periods_done <= 0:
+            return rule
+        aligned = self.recurrence_start + periods_done * period
+        return rule.replace(dtstart=aligned, cache=True)
+
+    def _fast_occurrence_dates(
+        self, effective_start: datetime, end_date: datetime
+    ) -> Optional[list[datetime]]:
+        """Vectorized dates for fixed-step daily/weekly rules, else ``None``.
+
+        Plain daily and weekly series are arithmetic progressions, so the
+        dates come from one numpy range instead of dateutil's per-step
+        Python iteration. Rules with calendar filters (byweekday lists,
+        bymonthday, counts, ...) fall back to dateutil.
+        """
+        rule = self.recurrence_rule
+        start = self.recurrence_start
+        freq_days = {DAILY: 1, WEEKLY: 7}.get(rule._freq)
+        plain_weekday = rule._byweekday is None or (
+            rule._freq == WEEKLY and rule._byweekday == (start.weekday(),)
+        )
+        if (
+            freq_days is None
+            or not plain_weekday
+            or rule._count is not None
+            or rule._bymonthday
+            or rule._bymonth is not None
+            or rule._bysetpos is not None
+            or rule._byyearday is not None
+            or rule._byweekno is not None
+            or set(rule._byhour) != {start.hour}
+            or set(rule._byminute) != {start.minute}
+            or set(rule._bysecond) != {start.second}
+        ):
+            return None
+        step = timedelta(days=freq_days * rule._interval)
+        skipped = max(effective_start - start, timedelta(0)) // step
+        first = start + skipped * step
+        if first < effective_start:
+            first += step
+        last = end_date if rule._until is None else min(end_date, rule._until)
+        if first > last:
+            return []
+        count = (last - first) // step + 1
+        arr = np.datetime64(first, "us") + np.arange(
+            count, dtype="int64"
+        ) * np.timedelta64(int(step.total_seconds()), "s")
+        return arr.tolist()
+
+    def _occurrence_dates(
+        self, effective_start: datetime, end_date: datetime
+    ) -> list[datetime]:
+        key = (effective_start, end_date)
+        dates = self._occurrence_cache.get(key)
+        if dates is None:
+            dates = self._fast_occurrence_dates(effective_start, end_date)
+            if dates is None:
+                rule = self._clamped_rule(effective_start)
+                if rule._count is None:
+                    # Clip the rule itself so its iterator terminates at the
+                    # window edge instead of relying on between() to stop.
+                    until = (
+                        end_date
+                        if rule._until is None
+                        else min(rule._until, end_date)
+                    )
+                    clipped = rule.replace(until=until)
+                    dates = [dt for dt in clipped if dt >= effective_start]
+                else:
+                    dates = rule.between(effective_start, end_date, inc=True)
+            if len(self._occurrence_cache) >= 128:
+                self._occurrence_cache.clear()
+            self._occurrence_cache[key] = dates
+        return dates
+
+    def get_occurrences(self, start_date: datetime, end_date: datetime) -> list[Task]:
+        """Materialize occurrences as tasks within ``[start_date, end_date]``."""
+        if self.recurrence_rule is None:
+            return []
+        effective_start = max(start_date, self.recurrence_start)
+        # The date list is memoized, so sizing the result up front is free
+        # and skips the capacity-doubling growth of repeated appends.
+        count = len(self._occurrence_dates(effective_start, end_date))
+        result: list[Task] = [None] * count
+        for i, occurrence in enumerate(self.iter_occurrences(start_date, end_date)):
+            result[i] = occurrence
+        return result
+
+    def iter_occurrences(self, start_date: datetime, end_date: datetime):
+        """Yield occurrences lazily; preferred in loops to avoid the list."""
+        if self.recurrence_rule is None:
+            return
+        effective_start = max(start_date, self.recurrence_start)
+        occurrence_dates = self._occurrence_dates(effective_start, end_date)
+        if not occurrence_dates:
+            return
+        # The occurrence after the last in-range date bounds that date's due
+        # time; None means the series ends there and the duration is used.
+        next_occurrence = self.recurrence_rule.after(occurrence_dates[-1], inc=False)
+        dues = occurrence_dates[1:]
+        dues.append(next_occurrence or (occurrence_dates[-1] + self.duration))
+        # Shallow-copy a template per occurrence instead of running the full
+        # constructor. Profiles and dependency maps are handed out behind
+        # copy-on-write wrappers, so occurrences share the contents with the
+        # recurring task until one of them actually mutates.
+        template = Task(
+            title=self.title,
+            duration=self.duration,
+            description=self.description,
+            buffer_before=self.buffer_before,
+            buffer_after=self.buffer_after,
+            max_session_length=self.max_session_length,
+            min_session_length=self.min_session_length,
+            time_profiles=self.time_profiles,
+            dependencies=self.dependencies,
+            dependents=self.dependents,
+            subtask_ids=self.subtask_ids,
+            sessions=self.sessions,
+            parent_id=self.id,
+            tags=self.tags,
+        )
+        for occurrence_dt, due_date, occurrence_id in zip(
+            occurrence_dates, dues, _batch_uuid4(len(occurrence_dates))
+        ):
+            occurrence = copy.copy(template)
+            occurrence.id = occurrence_id
+            occurrence.starts_at = occurrence_dt
+            occurrence.due_date = due_date
+            occurrence.time_profiles = CowList(self.time_profiles)
+            occurrence.dependencies = CowDict(self.dependencies)
+            occurrence.dependents = CowDict(self.dependents)
+            occurrence.subtask_ids = CowList(self.subtask_ids)
+            occurrence.sessions = CowList(self.sessions)
+            yield occurrence
+
+    def get_next_occurrences(
+        self, count: int = 1, after: Optional[datetime] = None
+    ) -> list[datetime]:
+        """The next ``count`` occurrence datetimes strictly after ``after``."""
+        if self.recurrence_rule is None:
+            return []
+        if after is None:
+            after = datetime.now()
+        if after < self.recurrence_start:
+            return list(islice(self.recurrence_rule, count))
+        # xafter iterates forward from ``after`` without rebuilding the rule
+        # the way replace(dtstart=...) does.
+        return list(self.recurrence_rule.xafter(after, count=count, inc=False))
+
+    @property
+    def next_occurrence(self) -> Optional[datetime]:
+        if self.recurrence_rule is None:
+            return None
+        return self.recurrence_rule.after(datetime.now(), inc=False)
+
+    def get_occurrences_array(
+        self, start_date: datetime, end_date: datetime
+    ) -> TaskArray:
+        """Occurrences within the window as a :class:`TaskArray`.
+
+        Unlike :meth:`get_occurrences`, no per-occurrence :class:`Task`
+        objects are built; the start and due columns are filled with
+        vectorized shifts over the occurrence dates.
+        """
+        if self.recurrence_rule is None:
+            return TaskArray.empty()
+        effective_start = max(start_date, self.recurrence_start)
+        occurrence_dates = self._occurrence_dates(effective_start, end_date)
+        n = len(occurrence_dates)
+        if n == 0:
+            return TaskArray.empty()
+        duration_ns = int(self.duration.total_seconds() * 1_000_000_000)
+        starts_ns = np.array(occurrence_dates, dtype="datetime64[ns]").astype(
+            np.int64
+        )
+        # Each occurrence is due when the next one starts; the series tail
+        # falls back to its own start plus the duration.
+        next_occurrence = self.recurrence_rule.after(
+            occurrence_dates[-1], inc=False
+        )
+        fallback_ns = (
+            _datetime_to_ns(next_occurrence)
+            if next_occurrence is not None
+            else int(starts_ns[-1]) + duration_ns
+        )
+        due_ns = _compute_due_dates(starts_ns, fallback_ns)
+        return TaskArray(
+            ids=np.array(_batch_uuid4(n), dtype=object),
+            titles=np.full(n, self.title, dtype=object),
+            duration_ns=np.full(n, duration_ns, dtype=np.int64),
+            starts_ns=starts_ns,
+            due_ns=due_ns,
+            completed=np.zeros(n, dtype=bool),
+        )
+
+
+# Sentinel for "no datetime" in int64 nanosecond columns.
+_NS_NONE = np.iinfo(np.int64).min
+
+
+def _compute_due_dates_py(starts_ns: np.ndarray, fallback_ns: int) -> np.ndarray:
+    """Each start's due time is the next start; the tail gets the fallback."""
+    dues = np.empty(starts_ns.size, dtype=np.int64)
+    dues[:-1] = starts_ns[1:]
+    dues[-1] = fallback_ns
+    return dues
+
+
+try:
+    # numba is optional; when present the shift compiles to native code,
+    # otherwise the numpy implementation above is used directly.
+    from numba import njit
+except ImportError:
+    _compute_due_dates = _compute_due_dates_py
+else:
+    _compute_due_dates = njit(cache=True)(_compute_due_dates_py)
+
+
+def _datetime_to_ns(dt: Optional[datetime]) -> int:
+    if dt is None:
+        return _NS_NONE
+    return int(np.datetime64(dt, "ns").astype(np.int64))
+
+
+def _ns_to_datetime(ns: int) -> Optional[datetime]:
+    if ns == _NS_NONE:
+        return None
+    return np.int64(ns).astype("datetime64[ns]").astype("datetime64[us]").item()
+
+
+class TaskArray:
+    """Structure-of-arrays storage for homogeneous task collections.
+
+    Scheduling passes over thousands of occurrences touch only a few
+    fields per task; packing those into int64 nanosecond columns (with
+    object columns for ids and titles) cuts per-task memory several-fold
+    and lets callers filter with vectorized comparisons such as
+    ``array.due_ns < deadline_ns`` instead of Python attribute loops.
+    """
+
+    __slots__ = ("ids", "titles", "duration_ns", "starts_ns", "due_ns", "completed")
+
+    def __init__(
+        self,
+        ids: np.ndarray,
+        titles: np.ndarray,
+        duration_ns: np.ndarray,
+        starts_ns: np.ndarray,
+        due_ns: np.ndarray,
+        completed: np.ndarray,
+    ):
+        self.ids = ids
+        self.titles = titles
+        self.duration_ns = duration_ns
+        self.starts_ns = starts_ns
+        self.due_ns = due_ns
+        self.completed = completed
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @classmethod
+    def empty(cls) -> TaskArray:
+        return cls(
+            ids=np.empty(0, dtype=object),
+            titles=np.empty(0, dtype=object),
+            duration_ns=np.empty(0, dtype=np.int64),
+            starts_ns=np.empty(0, dtype=np.int64),
+            due_ns=np.empty(0, dtype=np.int64),
+            completed=np.empty(0, dtype=bool),
+        )
+
+    @classmethod
+    def from_tasks(cls, tasks: list[Task]) -> TaskArray:
+        n = len(tasks)
+        return cls(
+            ids=np.array([task.id for task in tasks], dtype=object),
+            titles=np.array([task.title for task in tasks], dtype=object),
+            duration_ns=np.array(
+                [int(task.duration.total_seconds() * 1_000_000_000) for task in tasks],
+                dtype=np.int64,
+            ),
+            starts_ns=np.array(
+                [_datetime_to_ns(task.starts_at) for task in tasks], dtype=np.int64
+            ),
+            due_ns=np.array(
+                [_datetime_to_ns(task.due_date) for task in tasks], dtype=np.int64
+            ),
+            completed=np.array([task.completed for task in tasks], dtype=bool),
+        )
+
+    def to_tasks(self) -> list[Task]:
+        return [
+            Task(
+                title=self.titles[i],
+                duration=timedelta(microseconds=int(self.duration_ns[i]) // 1000),
+                due_date=_ns_to_datetime(int(self.due_ns[i])),
+                id=self.ids[i],
+                starts_at=_ns_to_datetime(int(self.starts_ns[i])),
+                completed=bool(self.completed[i]),
+            )
+            for i in range(len(self.ids))
+        ]
+
+
+def project_many(
+    tasks: list[Task], start_date: datetime, days: int
+) -> list[TimeDomain]:
+    """Project the scheduling domain of every task, in input order.
+
+    Projections share no state, so large batches spread across a process
+    pool and scale with the available cores; small batches run serially
+    to avoid paying the pool startup cost.
+    """
+    if len(tasks) <= 4:
+        return [task.project_time_domain(start_date, days) for task in tasks]
+    workers = min(len(tasks), os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(
+            executor.map(
+                partial(Task.project_time_domain, start_date=start_date, days=days),
+                tasks,
+            )
+        )
+
+
+class DependencyGraph:
+    """Scheduling index over the dependency DAG of a set of tasks.
+
+    One build computes Kahn's topological order and each task's transitive
+    dependent count; afterwards the scheduler can repeatedly ask for ready
+    tasks (most-depended-on first) with dict lookups instead of re-walking
+    the graph. The index rebuilds itself lazily when dependency edges have
+    been added since it was built.
+    """
+
+    def __init__(self, tasks: dict[str, Task]):
+        self._tasks = tasks
+        self._order: list[str] = []
+        self._weight: dict[str, int] = {}
+        self._version = -1
+        self._build()
+
+    def _build(self) -> None:
+        tasks = self._tasks
+        indegree = {
+            task_id: sum(
+                1 for dep_ix in task.dependencies if TaskIndex.id_for(dep_ix) in tasks
+            )
+            for task_id, task in tasks.items()
+        }
+        ready = deque(task_id for task_id, deg in indegree.items() if deg == 0)
+        order: list[str] = []
+        while ready:
+            task_id = ready.popleft()
+            order.append(task_id)
+            for dependent_ix in tasks[task_id].dependents:
+                dependent_id = TaskIndex.id_for(dependent_ix)
+                if dependent_id in indegree:
+                    indegree[dependent_id] -= 1
+                    if indegree[dependent_id] == 0:
+                        ready.append(dependent_id)
+        if len(order) != len(tasks):
+            raise ValueError("Dependency graph contains a cycle")
+        self._order = order
+        # Transitive dependents, accumulated in reverse topological order;
+        # sets keep diamond-shaped graphs from double counting.
+        reachable: dict[str, set[str]] = {task_id: set() for task_id in tasks}
+        for task_id in reversed(order):
+            reached = reachable[task_id]
+            for dependent_ix in tasks[task_id].dependents:
+                dependent_id = TaskIndex.id_for(dependent_ix)
+                if dependent_id in reachable:
+                    reached.add(dependent_id)
+                    reached |= reachable[dependent_id]
+        self._weight = {task_id: len(r) for task_id, r in reachable.items()}
+        self._version = _dep_version
+
+    @property
+    def order(self) -> list[str]:
+        """Task ids in topological order."""
+        if self._version != _dep_version:
+            self._build()
+        return list(self._order)
+
+    def weight(self, task_id: str) -> int:
+        """How many tasks transitively depend on ``task_id``."""
+        if self._version != _dep_version:
+            self._build()
+        return self._weight[task_id]
+
+    def ready_tasks(self, completed: set[str]) -> Iterator[Task]:
+        """Tasks whose dependencies are all completed, heaviest first."""
+        if self._version != _dep_version:
+            self._build()
+        ready = [
+            task_id
+            for task_id in self._order
+            if task_id not in completed
+            and all(
+                TaskIndex.id_for(dep_ix) in completed
+                or TaskIndex.id_for(dep_ix) not in self._tasks
+                for dep_ix in self._tasks[task_id].dependencies
+            )
+        ]
+        ready.sort(key=lambda task_id: -self._weight[task_id])
+        for task_id in ready:
+            yield self._tasks[task_id]
@@ -0,0 +1,475 @@
+"""Concrete availability over a date range, represented as datetime slots."""
+
+from __future__ import annotations
+
+import bisect
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Optional
+
+import numpy as np
+
+from .timeprofile import DayOfWeek, TimeProfile
+
+
+@dataclass(frozen=True, slots=True)
+class TimeSlot:
+    """An immutable half-open span of time ``[start, end)``."""
+
+    start: datetime
+    end: datetime
+    # Computed once at construction; slots are immutable, so neither the
+    # datetime subtraction nor the hash ever needs to happen again on hot
+    # lookups.
+    _duration: timedelta = field(init=False, repr=False, compare=False)
+    _hash: int = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        object.__setattr__(self, "_duration", self.end - self.start)
+        object.__setattr__(self, "_hash", hash((self.start, self.end)))
+
+    @property
+    def duration(self) -> timedelta:
+        return self._duration
+
+    def overlaps(self, other: TimeSlot) -> bool:
+        return self.start < other.end and self.end > other.start
+
+    def contains(self, dt: datetime) -> bool:
+        return self.start <= dt < self.end
+
+    def __hash__(self) -> int:
+        return self._hash
+
+    def __str__(self) -> str:
+        return f"{self.start:%Y-%m-%d %H:%M} - {self.end:%H:%M}"
+
+
+@dataclass
+class TimeDomain:
+    """A set of available time slots that scheduling operations carve up.
+
+    ``time_slots`` is kept sorted by start with no overlapping or adjacent
+    slots; every mutator preserves the invariant, so lookups can bisect
+    instead of scanning.
+    """
+
+    time_slots: list[TimeSlot] = field(default_factory=list)
+    # Parallel int64 epoch-microsecond views of the slot bounds, built lazily
+    # and dropped by every mutator; bulk numeric passes use these instead
+    # of comparing datetime objects slot by slot.
+    _bounds_cache: Optional[tuple[np.ndarray, np.ndarray]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    def _bounds(self) -> tuple[np.ndarray, np.ndarray]:
+        if self._bounds_cache is None:
+            self._bounds_cache = (
+                np.array(
+                    [slot.start for slot in self.time_slots], dtype="datetime64[us]"
+                ).astype(np.int64),
+                np.array(
+                    [slot.end for slot in self.time_slots], dtype="datetime64[us]"
+                ).astype(np.int64),
+            )
+        return self._bounds_cache
+
+    def _invalidate(self) -> None:
+        self._bounds_cache = None
+
+    def _overlaps_mask(
+        self, other_starts: np.ndarray, other_ends: np.ndarray
+    ) -> np.ndarray:
+        """Boolean matrix: ``mask[i, j]`` is True when slot i overlaps span j.
+
+        One broadcast compare over the int64 bound arrays, for callers
+        probing arbitrary (possibly unsorted) span arrays; domain-vs-domain
+        queries should prefer the linear kernel in :meth:`find_conflicts`.
+        """
+        starts, ends = self._bounds()
+        return (starts[:, None] < other_ends[None, :]) & (
+            ends[:, None] > other_starts[None, :]
+        )
+
+    @classmethod
+    def from_time_profile(
+        cls, profile: TimeProfile, start_date: datetime, days: int
+    ) -> TimeDomain:
+        """Expand a weekly profile into concrete slots over ``days`` days.
+
+        Window offsets within each weekday are computed once as int64
+        microsecond arrays and broadcast across the day range, so building a
+        year of slots costs a handful of array ops instead of a
+        ``datetime.replace`` pair per window per day.
+        """
+        day_us = 86_400 * 1_000_000
+        # Seconds-from-midnight per weekday, merged the way repeated
+        # add_slot calls would merge overlapping windows.
+        offsets: list[tuple[np.ndarray, np.ndarray]] = []
+        for day in DayOfWeek:
+            windows = profile.day_schedules[day].time_windows
+            spans: list[tuple[int, int]] = []
+            for window in sorted(windows, key=lambda w: w.start_time):
+                start_us = (
+                    window.start_time.hour * 3600 + window.start_time.minute * 60
+                ) * 1_000_000
+                end_us = (
+                    window.end_time.hour * 3600 + window.end_time.minute * 60
+                ) * 1_000_000
+                if spans and start_us <= spans[-1][1]:
+                    spans[-1] = (spans[-1][0], max(spans[-1][1], end_us))
+                else:
+                    spans.append((start_us, end_us))
+            offsets.append(
+                (
+                    np.array([s for s, _ in spans], dtype=np.int64),
+                    np.array([e for _, e in spans], dtype=np.int64),
+                )
+            )
+        midnight = start_date.replace(hour=0, minute=0, second=0, microsecond=0)
+        base_us = np.datetime64(midnight, "us").astype(np.int64)
+        weekday = midnight.weekday()
+        start_parts = []
+        end_parts = []
+        for i in range(days):
+            day_starts, day_ends = offsets[(weekday + i) % 7]
+            if len(day_starts):
+                start_parts.append(base_us + i * day_us + day_starts)
+                end_parts.append(base_us + i * day_us + day_ends)
+        if not start_parts:
+            return cls()
+        return _from_bounds(np.concatenate(start_parts), np.concatenate(end_parts))
+
+    def add_slot(self, start: datetime, end: datetime) -> None:
+        """Insert ``[start, end)``, merging any slots it touches."""
+        slots = self.time_slots
+        lo = bisect.bisect_left(slots, start, key=lambda s: s.start)
+        if lo > 0 and slots[lo - 1].end >= start:
+            lo -= 1
+        hi = lo
+        while hi < len(slots) and slots[hi].start <= end:
+            start = min(start, slots[hi].start)
+            end = max(end, slots[hi].end)
+            hi += 1
+        slots[lo:hi] = [TimeSlot(start, end)]
+        self._invalidate()
+
+    def remove_slot(self, slot: TimeSlot) -> None:
+        self.time_slots.remove(slot)
+        self._invalidate()
+
+    def copy(self) -> TimeDomain:
+        """A cheap copy sharing the immutable TimeSlot instances."""
+        domain = TimeDomain(list(self.time_slots))
+        domain._bounds_cache = self._bounds_cache
+        return domain
+
+    def subtract_slot(self, subtract_slot: TimeSlot) -> None:
+        """Remove ``subtract_slot`` from the domain, splitting slots as needed."""
+        slots = self.time_slots
+        lo = bisect.bisect_left(slots, subtract_slot.start, key=lambda s: s.start)
+        if lo > 0 and slots[lo - 1].end > subtract_slot.start:
+            lo -= 1
+        replacement = []
+        hi = lo
+        while hi < len(slots) and slots[hi].start < subtract_slot.end:
+            slot = slots[hi]
+            if slot.start < subtract_slot.start:
+                replacement.append(TimeSlot(slot.start, subtract_slot.start))
+            if slot.end > subtract_slot.end:
+                replacement.append(TimeSlot(subtract_slot.end, slot.end))
+            hi += 1
+        slots[lo:hi] = replacement
+        self._invalidate()
+
+    def subtract(self, other: TimeDomain) -> TimeDomain:
+        """A new domain with every span of ``other`` removed.
+
+        Both bound arrays are walked once by the int64 kernel instead of
+        calling :meth:`subtract_slot` per span on a deep copy.
+        """
+        if not self.time_slots or not other.time_slots:
+            return self.copy()
+        starts, ends = self._bounds()
+        other_starts, other_ends = other._bounds()
+        out_starts, out_ends = _subtract_kernel(starts, ends, other_starts, other_ends)
+        return _from_bounds(out_starts, out_ends)
+
+    def apply_constraint(self, other: TimeDomain) -> TimeDomain:
+        """Intersect this domain with another, keeping only shared time.
+
+        The bound arrays are walked with two pointers, advancing whichever
+        slot ends first; every comparison in the loop is a plain integer
+        compare, with datetimes rebuilt only for the resulting slots.
+        """
+        if not self.time_slots or not other.time_slots:
+            return TimeDomain()
+        starts, ends = (a.tolist() for a in self._bounds())
+        other_starts, other_ends = (a.tolist() for a in other._bounds())
+        out_starts: list[int] = []
+        out_ends: list[int] = []
+        i = j = 0
+        while i < len(starts) and j < len(other_starts):
+            start = max(starts[i], other_starts[j])
+            end = min(ends[i], other_ends[j])
+            if start < end:
+                out_starts.append(start)
+                out_ends.append(end)
+            if ends[i] <= other_ends[j]:
+                i += 1
+            else:
+                j += 1
+        return _from_bounds(
+            np.array(out_starts, dtype=np.int64), np.array(out_ends, dtype=np.int64)
+        )
+
+    def intersect_many(self, others: list[TimeDomain]) -> TimeDomain:
+        """Intersect this domain with every domain in ``others`` at once.
+
+        Equivalent to folding :meth:`apply_constraint` over the domains,
+        but sweeps all interval endpoints in one sorted pass, emitting the
+        spans where every domain is active, instead of rebuilding an
+        intermediate domain per constraint.
+        """
+        domains = [self, *others]
+        bounds = []
+        for domain in domains:
+            if not domain.time_slots:
+                return TimeDomain()
+            bounds.append(domain._bounds())
+        times = np.concatenate(
+            [starts for starts, _ in bounds] + [ends for _, ends in bounds]
+        )
+        total = times.size // 2
+        deltas = np.concatenate(
+            (np.ones(total, dtype=np.int64), np.full(total, -1, dtype=np.int64))
+        )
+        # Ends sort before coincident starts (-1 < 1), so touching spans
+        # from different domains never produce a zero-width intersection.
+        order = np.lexsort((deltas, times))
+        times_list = times.tolist()
+        deltas_list = deltas.tolist()
+        out_starts: list[int] = []
+        out_ends: list[int] = []
+        active = 0
+        span_start = 0
+        for idx in order.tolist():
+            if deltas_list[idx] == 1:
+                active += 1
+                if active == len(domains):
+                    span_start = times_list[idx]
+            else:
+                if active == len(domains):
+                    out_starts.append(span_start)
+                    out_ends.append(times_list[idx])
+                active -= 1
+        return _from_bounds(
+            np.array(out_starts, dtype=np.int64), np.array(out_ends, dtype=np.int64)
+        )
+
+    def find_conflicts(self, other: TimeDomain) -> list[tuple[TimeSlot, TimeSlot]]:
+        """Overlapping slot pairs between the two domains.
+
+        The overlap scan runs on the int64 bound arrays (compiled with
+        numba when available) and only the matching indices come back to
+        Python, so no datetime comparisons happen in the inner loop.
+        """
+        if not self.time_slots or not other.time_slots:
+            return []
+        starts, ends = self._bounds()
+        other_starts, other_ends = other._bounds()
+        ours, theirs = _find_conflicts_kernel(starts, ends, other_starts, other_ends)
+        return [
+            (self.time_slots[i], other.time_slots[j])
+            for i, j in zip(ours.tolist(), theirs.tolist())
+        ]
+
+    def trim_left(self, time_point: datetime) -> None:
+        """Discard all availability before ``time_point``."""
+        slots = self.time_slots
+        # Disjoint sorted slots have sorted ends too, so bisect on end.
+        idx = bisect.bisect_right(slots, time_point, key=lambda s: s.end)
+        if idx == 0 and (not slots or slots[0].start >= time_point):
+            return
+        del slots[:idx]
+        if slots and slots[0].start < time_point:
+            slots[0] = TimeSlot(time_point, slots[0].end)
+        self._invalidate()
+
+    def trim_right(self, time_point: datetime) -> None:
+        """Discard all availability after ``time_point``."""
+        slots = self.time_slots
+        idx = bisect.bisect_left(slots, time_point, key=lambda s: s.start)
+        if idx == len(slots) and (not slots or slots[-1].end <= time_point):
+            return
+        del slots[idx:]
+        if slots and slots[-1].end > time_point:
+            slots[-1] = TimeSlot(slots[-1].start, time_point)
+        self._invalidate()
+
+    def is_time_available(self, start: datetime, end: datetime) -> bool:
+        slots = self.time_slots
+        idx = bisect.bisect_left(slots, end, key=lambda s: s.start)
+        return idx > 0 and slots[idx - 1].end > start
+
+    def get_earliest_slot(self) -> Optional[TimeSlot]:
+        if not self.time_slots:
+            return None
+        return self.time_slots[0]
+
+    def get_available_slots(self, min_duration: timedelta) -> list[TimeSlot]:
+        return [slot for slot in self.time_slots if slot.duration >= min_duration]
+
+    @property
+    def total_available_time(self) -> timedelta:
+        starts, ends = self._bounds()
+        return timedelta(microseconds=int((ends - starts).sum()))
+
+    def visualize(self, start_date: datetime, days: int = 7) -> str:
+        """Render an hour-by-day grid of availability as text.
+
+        Each slot paints its hour range into a boolean grid with one slice
+        write per day it touches, instead of probing every (hour, day) cell
+        against every slot.
+        """
+        hour_us = 3_600 * 1_000_000
+        day_us = 24 * hour_us
+        # The old per-cell probe spanned [hh:00, hh:59:59); keep its edge
+        # behavior: a slot entering only the final second of an hour does
+        # not mark it.
+        probe_us = hour_us - 1_000_000
+        base = start_date.replace(hour=0, minute=0, second=0, microsecond=0)
+        base_us = np.datetime64(base, "us").astype(np.int64)
+        grid = np.zeros((24, days), dtype=bool)
+        if days > 0:
+            for slot_start, slot_end in zip(*(a.tolist() for a in self._bounds())):
+                first_day = max(0, (slot_start - base_us) // day_us)
+                last_day = min(days, -((base_us - slot_end) // day_us))
+                for d in range(first_day, last_day):
+                    day_base = base_us + d * day_us
+                    start_off = max(slot_start - day_base, 0)
+                    end_off = min(slot_end - day_base, day_us)
+                    h_lo = start_off // hour_us + (start_off % hour_us >= probe_us)
+                    h_hi = (end_off + hour_us - 1) // hour_us
+                    grid[h_lo:h_hi, d] = True
+        lines = []
+        header = "      " + " ".join(
+            f"{(start_date + timedelta(days=d)):%a}" for d in range(days)
+        )
+        lines.append(header)
+        for hour in range(24):
+            cells = ["###" if on else "..." for on in grid[hour]]
+            lines.append(f"{hour:02d}:00 " + " ".join(cells))
+        return "\n".join(lines)
+
+    def __bool__(self) -> bool:
+        return bool(self.time_slots)
+
+    def __str__(self) -> str:
+        return "\n".join(str(slot) for slot in sorted(self.time_slots, key=lambda s: s.start))
+
+
+def _find_conflicts_kernel_py(
+    starts1: np.ndarray,
+    ends1: np.ndarray,
+    starts2: np.ndarray,
+    ends2: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Index pairs (i, j) where slot i of one domain overlaps slot j of the other.
+
+    Both domains are sorted and disjoint, so a shared lower pointer makes
+    the scan O(n + m + k) for k overlaps.
+    """
+    n = starts1.size
+    m = starts2.size
+    cap = 16
+    out_i = np.empty(cap, dtype=np.int64)
+    out_j = np.empty(cap, dtype=np.int64)
+    count = 0
+    lo = 0
+    for i in range(n):
+        while lo < m and ends2[lo] <= starts1[i]:
+            lo += 1
+        j = lo
+        while j < m and starts2[j] < ends1[i]:
+            if count == cap:
+                cap *= 2
+                grown_i = np.empty(cap, dtype=np.int64)
+                grown_i[:count] = out_i
+                out_i = grown_i
+                grown_j = np.empty(cap, dtype=np.int64)
+                grown_j[:count] = out_j
+                out_j = grown_j
+            out_i[count] = i
+            out_j[count] = j
+            count += 1
+            j += 1
+    return out_i[:count], out_j[:count]
+
+
+def _subtract_kernel_py(
+    starts: np.ndarray,
+    ends: np.ndarray,
+    sub_starts: np.ndarray,
+    sub_ends: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Remove the sorted spans (sub_starts, sub_ends) from (starts, ends).
+
+    Single merge-style pass; the result has at most n + m spans, so the
+    output arrays are preallocated and trimmed at the end.
+    """
+    n = starts.size
+    m = sub_starts.size
+    out_starts = np.empty(n + m, dtype=np.int64)
+    out_ends = np.empty(n + m, dtype=np.int64)
+    count = 0
+    lo = 0
+    for i in range(n):
+        cursor = starts[i]
+        end = ends[i]
+        while lo < m and sub_ends[lo] <= cursor:
+            lo += 1
+        j = lo
+        while j < m and sub_starts[j] < end:
+            if sub_starts[j] > cursor:
+                out_starts[count] = cursor
+                out_ends[count] = sub_starts[j]
+                count += 1
+            if sub_ends[j] > cursor:
+                cursor = sub_ends[j]
+            j += 1
+        if cursor < end:
+            out_starts[count] = cursor
+            out_ends[count] = end
+            count += 1
+    return out_starts[:count], out_ends[:count]
+
+
+try:
+    # numba is optional; when present the int64 scans compile to native
+    # code, otherwise the Python implementations above run as-is.
+    from numba import njit
+except ImportError:
+    _find_conflicts_kernel = _find_conflicts_kernel_py
+    _subtract_kernel = _subtract_kernel_py
+else:
+    _find_conflicts_kernel = njit(cache=True)(_find_conflicts_kernel_py)
+    _subtract_kernel = njit(cache=True)(_subtract_kernel_py)
+
+
+def _from_bounds(starts: np.ndarray, ends: np.ndarray) -> TimeDomain:
+    """A TimeDomain from sorted disjoint epoch-microsecond bound arrays.
+
+    Builds the datetime-level slots in one conversion pass and seeds the
+    bound-array cache with the inputs.
+    """
+    domain = TimeDomain()
+    domain.time_slots = [
+        TimeSlot(start, end)
+        for start, end in zip(
+            starts.astype("datetime64[us]").tolist(),
+            ends.astype("datetime64[us]").tolist(),
+        )
+    ]
+    domain._bounds_cache = (starts, ends)
+    return domain
@@ -0,0 +1,210 @@
+"""Weekly availability profiles describing when work is allowed to happen."""
+
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass, field
+from datetime import datetime, time
+from enum import Enum
+
+import numpy as np
+
+
+def _time_to_us(t: time) -> int:
+    """Microseconds since midnight; total-order key for times of day."""
+    return ((t.hour * 3600 + t.minute * 60 + t.second) * 1_000_000) + t.microsecond
+
+
+class DayOfWeek(Enum):
+    """Days of the week, numbered to match ``datetime.weekday()``."""
+
+    MONDAY = 0
+    TUESDAY = 1
+    WEDNESDAY = 2
+    THURSDAY = 3
+    FRIDAY = 4
+    SATURDAY = 5
+    SUNDAY = 6
+
+
+# Indexable by datetime.weekday(); cheaper than DayOfWeek(value) on hot
+# paths since Enum.__call__ goes through a dict lookup and validation.
+_DOW = tuple(DayOfWeek)
+
+
+@dataclass(slots=True)
+class TimeWindow:
+    """A contiguous window of availability within a single day."""
+
+    day: DayOfWeek
+    start_time: time
+    end_time: time
+
+    def __post_init__(self):
+        if self.start_time >= self.end_time:
+            raise ValueError(
+                f"Window start {self.start_time} must be before end {self.end_time}"
+            )
+
+    def contains_time(self, t: time) -> bool:
+        """Whether ``t`` falls inside this window (half-open: [start, end))."""
+        return self.start_time <= t < self.end_time
+
+    def overlaps(self, other: TimeWindow) -> bool:
+        """Whether two windows on the same day share any time."""
+        return (
+            self.day == other.day
+            and self.start_time < other.end_time
+            and self.end_time > other.start_time
+        )
+
+
+@dataclass(slots=True)
+class DaySchedule:
+    """The set of availability windows for one day of the week."""
+
+    day: DayOfWeek
+    time_windows: list[TimeWindow] = field(default_factory=list)
+    # Sorted, merged microsecond-of-day bounds over ``time_windows``, built
+    # lazily so availability probes bisect instead of scanning every window.
+    _spans_cache: tuple[np.ndarray, np.ndarray] | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    def add_window(self, window: TimeWindow) -> None:
+        if window.day != self.day:
+            raise ValueError(f"Window for {window.day} added to {self.day} schedule")
+        self.time_windows.append(window)
+        self._spans_cache = None
+
+    def _spans(self) -> tuple[np.ndarray, np.ndarray]:
+        if self._spans_cache is None:
+            spans: list[tuple[int, int]] = []
+            for window in sorted(self.time_windows, key=lambda w: w.start_time):
+                start_us = _time_to_us(window.start_time)
+                end_us = _time_to_us(window.end_time)
+                if spans and start_us <= spans[-1][1]:
+                    spans[-1] = (spans[-1][0], max(spans[-1][1], end_us))
+                else:
+                    spans.append((start_us, end_us))
+            self._spans_cache = (
+                np.array([s for s, _ in spans], dtype=np.int64),
+                np.array([e for _, e in spans], dtype=np.int64),
+            )
+        return self._spans_cache
+
+    def is_available_at(self, t: time) -> bool:
+        starts, ends = self._spans()
+        t_us = _time_to_us(t)
+        idx = int(starts.searchsorted(t_us, side="right")) - 1
+        return idx >= 0 and t_us < ends[idx]
+
+
+@dataclass
+class WeeklySchedule:
+    """A flat set of weekly availability windows, used by the basic scheduler."""
+
+    windows: list[TimeWindow] = field(default_factory=list)
+    _by_weekday: list[list[TimeWindow]] | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    def add_window(self, window: TimeWindow) -> None:
+        self.windows.append(window)
+        self._by_weekday = None
+
+    def get_windows_for_day(self, day: DayOfWeek) -> list[TimeWindow]:
+        return self.get_windows_for_weekday(day.value)
+
+    def get_windows_for_weekday(self, weekday: int) -> list[TimeWindow]:
+        """Windows for a plain int weekday (0=Monday).
+
+        Used on scheduling hot paths so callers can index with
+        ``date.weekday()`` directly instead of constructing a DayOfWeek.
+        """
+        if self._by_weekday is None:
+            by_weekday: list[list[TimeWindow]] = [[] for _ in range(7)]
+            for window in self.windows:
+                by_weekday[window.day.value].append(window)
+            self._by_weekday = by_weekday
+        return self._by_weekday[weekday]
+
+
+@dataclass(slots=True)
+class TimeProfile:
+    """A named weekly availability pattern (e.g. "work hours", "evenings")."""
+
+    name: str
+    # os.urandom(8).hex() gives a collision-safe opaque id for a handful of
+    # named profiles at a fraction of uuid4's construction cost.
+    id: str = field(default_factory=lambda: os.urandom(8).hex())
+    day_schedules: dict[DayOfWeek, DaySchedule] = field(default_factory=dict)
+    # (7, 1440) minute-of-week availability grid for bulk queries, built
+    # lazily and rebuilt after any window change.
+    _minute_masks_cache: np.ndarray | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    def __post_init__(self):
+        for day in DayOfWeek:
+            if day not in self.day_schedules:
+                self.day_schedules[day] = DaySchedule(day)
+
+    def add_window(self, day: DayOfWeek, start_time: time, end_time: time) -> None:
+        self.day_schedules[day].add_window(TimeWindow(day, start_time, end_time))
+        self._minute_masks_cache = None
+
+    def _minute_masks(self) -> np.ndarray:
+        if self._minute_masks_cache is None:
+            masks = np.zeros((7, 1440), dtype=bool)
+            for day in DayOfWeek:
+                for window in self.day_schedules[day].time_windows:
+                    start_min = window.start_time.hour * 60 + window.start_time.minute
+                    end_min = window.end_time.hour * 60 + window.end_time.minute
+                    masks[day.value, start_min:end_min] = True
+            self._minute_masks_cache = masks
+        return self._minute_masks_cache
+
+    def available_mask(self, dt_array: np.ndarray) -> np.ndarray:
+        """Boolean availability for an array of datetimes, at minute resolution.
+
+        Accepts anything convertible to ``datetime64[m]`` and indexes the
+        minute-of-week grid in one vectorized step, so scanning a whole
+        horizon costs two modulo ops and a fancy index instead of a Python
+        call per probe.
+        """
+        minutes = np.asarray(dt_array, dtype="datetime64[m]").astype(np.int64)
+        # The epoch (1970-01-01) was a Thursday, weekday 3.
+        weekday = (minutes // 1440 + 3) % 7
+        return self._minute_masks()[weekday, minutes % 1440]
+
+    def get_windows_for_day(self, day: DayOfWeek) -> list[TimeWindow]:
+        return self.day_schedules[day].time_windows
+
+    def is_datetime_available(self, dt: datetime) -> bool:
+        return self.day_schedules[_DOW[dt.weekday()]].is_available_at(dt.time())
+
+    def remove_time(self, day: DayOfWeek, start: time, end: time) -> None:
+        """Carve ``[start, end)`` out of the day's windows, splitting as needed."""
+        remove_start = start.hour * 60 + start.minute
+        remove_end = end.hour * 60 + end.minute
+        new_windows: list[TimeWindow] = []
+        changed = False
+        for window in self.day_schedules[day].time_windows:
+            window_start = window.start_time.hour * 60 + window.start_time.minute
+            window_end = window.end_time.hour * 60 + window.end_time.minute
+            if window_end <= remove_start or window_start >= remove_end:
+                new_windows.append(window)
+                continue
+            changed = True
+            if window_start < remove_start:
+                new_windows.append(TimeWindow(day, window.start_time, start))
+            if window_end > remove_end:
+                new_windows.append(TimeWindow(day, end, window.end_time))
+        if not changed:
+            # Nothing overlapped the removal range; keep the existing list
+            # and, more importantly, the derived caches.
+            return
+        self.day_schedules[day].time_windows = new_windows
+        self.day_schedules[day]._spans_cache = None
+        self._minute_masks_cache = None
@@ -0,0 +1,195 @@
+"""Tests for missminutes core behavior."""
+
+import os
+import shutil
+import tempfile
+import unittest
+from dataclasses import replace
+from datetime import date, datetime, time, timedelta
+from functools import cached_property
+
+import pytest
+
+from missminutes.basic_scheduler import BasicScheduler, ScheduledTask
+from missminutes.json_store import JsonStore
+from missminutes.scheduler import SchedulingError
+from missminutes.tasks import Task
+from missminutes.timeprofile import DayOfWeek, TimeWindow, WeeklySchedule
+
+# Shared fixture dates: tasks are due Wednesday evening and scheduling
+# starts the Monday of that week.
+DUE_MAR20 = datetime(2024, 3, 20, 17, 0)
+MONDAY_MAR18 = date(2024, 3, 18)
+
+# Enum attribute access goes through the metaclass; bind the days the
+# tests use once.
+MON = DayOfWeek.MONDAY
+WEEKDAYS = tuple(DayOfWeek)[:5]
+
+
+class TestMinutes(unittest.TestCase):
+    # One tmpdir for the class; each test gets a subdirectory, created
+    # only if it actually touches the store.
+    @classmethod
+    def setUpClass(cls):
+        cls._root = tempfile.mkdtemp()
+        # Schedulers are stateless across schedule_tasks calls, so the
+        # scheduling tests can share these instead of rebuilding the same
+        # window/schedule graph each.
+        schedule_9_17 = WeeklySchedule()
+        schedule_9_17.add_window(TimeWindow(MON, time(9, 0), time(17, 0)))
+        cls.scheduler_9_17 = BasicScheduler(schedule_9_17)
+        schedule_9_12 = WeeklySchedule()
+        schedule_9_12.add_window(TimeWindow(MON, time(9, 0), time(12, 0)))
+        cls.scheduler_9_12 = BasicScheduler(schedule_9_12)
+        # Canonical task fixture; tests that don't care about id uniqueness
+        # derive from it with dataclasses.replace instead of re-running the
+        # constructor (and its uuid generation). test_task_creation keeps
+        # calling Task() directly so the id generator stays exercised.
+        cls.template_task = Task(
+            title="template",
+            duration=timedelta(hours=1),
+            due_date=DUE_MAR20,
+        )
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls._root)
+
+    def setUp(self):
+        self.test_dir = os.path.join(self._root, self._testMethodName)
+
+    @cached_property
+    def store(self):
+        return JsonStore(self.test_dir)
+
+    @pytest.mark.fast
+    def test_task_lifecycle(self):
+        # Constructed directly (not via the template) so id generation
+        # stays exercised.
+        task = Task(
+            title="Write report",
+            duration=timedelta(hours=2),
+            due_date=DUE_MAR20,
+        )
+        self.assertIsNotNone(task.id)
+        self.assertEqual(task.title, "Write report")
+        self.assertEqual(task.duration, timedelta(hours=2))
+        self.assertFalse(task.completed)
+        task.mark_complete()
+        self.assertTrue(task.completed)
+        task.mark_incomplete()
+        self.assertFalse(task.completed)
+
+    @pytest.mark.fast
+    def test_time_window_validation(self):
+        with self.assertRaises(ValueError):
+            TimeWindow(MON, time(17, 0), time(9, 0))
+
+    @pytest.mark.io
+    def test_json_storage(self):
+        task = Task(
+            title="Persist me",
+            duration=timedelta(hours=1),
+            due_date=DUE_MAR20,
+        )
+        self.store.save_tasks([task])
+        loaded = self.store.load_tasks()
+        self.assertEqual(len(loaded), 1)
+        self.assertEqual(loaded[0].id, task.id)
+        self.assertEqual(loaded[0].title, "Persist me")
+        self.assertEqual(loaded[0].duration, timedelta(hours=1))
+        self.assertEqual(loaded[0].due_date, task.due_date)
+
+    @pytest.mark.fast
+    def test_basic_scheduling(self):
+        task1 = replace(
+            self.template_task, title="Task 1", duration=timedelta(hours=2)
+        )
+        task2 = replace(self.template_task, title="Task 2")
+        # Hand tasks over already in due-date order; the scheduler's stable
+        # internal sort then degenerates to a linear verification pass, which
+        # is the call pattern callers with pre-sorted backlogs should use.
+        tasks = sorted([task1, task2], key=lambda t: t.due_date)
+        scheduled = self.scheduler_9_17.schedule_tasks(tasks, MONDAY_MAR18)
+        self.assertEqual(len(scheduled), 2)
+        self.assertEqual(scheduled[0].start_time, datetime(2024, 3, 18, 9, 0))
+        self.assertEqual(scheduled[1].start_time, datetime(2024, 3, 18, 11, 0))
+
+    @pytest.mark.fast
+    def test_scheduling_conflicts(self):
+        existing_task = replace(
+            self.template_task, title="Existing", duration=timedelta(hours=2)
+        )
+        existing = [
+            ScheduledTask(
+                existing_task,
+                datetime(2024, 3, 18, 9, 0),
+                datetime(2024, 3, 18, 11, 0),
+            )
+        ]
+        task = replace(self.template_task, title="New task")
+        scheduled = self.scheduler_9_17.schedule_tasks(
+            [task], MONDAY_MAR18, existing_scheduled_tasks=existing
+        )
+        self.assertEqual(scheduled[0].start_time, datetime(2024, 3, 18, 11, 0))
+
+    @pytest.mark.fast
+    def test_back_to_back_intervals(self):
+        """Half-open intervals: a task may start exactly where one ends."""
+        tasks = [
+            replace(self.template_task, title=f"hour {i}") for i in range(3)
+        ]
+        scheduled = self.scheduler_9_12.schedule_tasks(tasks, MONDAY_MAR18)
+        self.assertEqual(
+            [st.start_time for st in scheduled],
+            [
+                datetime(2024, 3, 18, 9, 0),
+                datetime(2024, 3, 18, 10, 0),
+                datetime(2024, 3, 18, 11, 0),
+            ],
+        )
+
+    @pytest.mark.fast
+    def test_scheduling_scales(self):
+        # A batch large enough that the scheduler's placement loop, not
+        # fixture setup, dominates; guards the loop against regressions.
+        schedule = WeeklySchedule()
+        for day in WEEKDAYS:
+            schedule.add_window(TimeWindow(day, time(9, 0), time(17, 0)))
+        scheduler = BasicScheduler(schedule)
+        due = datetime(2024, 3, 29, 17, 0)
+        tasks = [
+            replace(
+                self.template_task,
+                title=f"t{i}",
+                duration=timedelta(minutes=15),
+                due_date=due,
+            )
+            for i in range(200)
+        ]
+        scheduled = scheduler.schedule_tasks(tasks, MONDAY_MAR18)
+        self.assertEqual(len(scheduled), 200)
+        self.assertEqual(scheduled[0].start_time, datetime(2024, 3, 18, 9, 0))
+        for earlier, later in zip(scheduled, scheduled[1:]):
+            self.assertLessEqual(earlier.end_time, later.start_time)
+        for st in scheduled:
+            self.assertLessEqual(st.end_time, due)
+            self.assertLess(st.start_time.weekday(), 5)
+            self.assertGreaterEqual(st.start_time.time(), time(9, 0))
+            self.assertLessEqual(st.end_time.time(), time(17, 0))
+
+    @pytest.mark.fast
+    def test_due_date_enforcement(self):
+        task = replace(
+            self.template_task,
+            title="Too late",
+            duration=timedelta(hours=2),
+            due_date=datetime(2024, 3, 18, 10, 0),
+        )
+        with self.assertRaises(SchedulingError):
+            self.scheduler_9_12.schedule_tasks([task], MONDAY_MAR18)
+
+
+if __name__ == "__main__":
+    unittest.main()